@@ -3,8 +3,14 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from pandas.api.types import union_categoricals
 import numpy as np
+import csv
+import hashlib
+import io
+import os
 import re
+import tempfile
 from datetime import datetime
 
 # Set page configuration
@@ -80,67 +86,343 @@ def validate_columns(df, required_columns):
 
 def clean_currency(series):
     """Convert currency strings to numeric"""
-    if series.dtype == "O":
-        series = series.astype(str).str.replace("$", "", regex=False).str.replace(",", "", regex=False).str.strip()
+    if not pd.api.types.is_numeric_dtype(series):
+        # Single regex pass strips "$", thousands separators and whitespace
+        series = series.str.replace(r"[$,\s]", "", regex=True)
+    # Stays float64: float32 sums drift in the cents (5478.67 shows as 5478.669434)
     return pd.to_numeric(series, errors="coerce")
 
+# Low-cardinality label columns stored as Categoricals (int codes for isin/groupby)
+CATEGORICAL_COLUMNS = [
+    "Product name", "Order status", "Charged", "Material name",
+    "Paper type", "Paper size", "Paper color", "Single or double sided",
+    "Special Information (Operator Only) Machine",
+    "Special Information (Operator Only) Job difficulty",
+    "Season"
+]
+
+def to_categorical(df, columns=CATEGORICAL_COLUMNS):
+    """Convert label columns present in df to category dtype"""
+    for col in columns:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+# Sensitive / unused columns dropped during cleaning
+COLUMNS_TO_REMOVE = [
+    'room name', 'Room name', 'title', 'Title', 'customer', 'Customer name',
+    'email', 'Email', 'last status update', 'Last status update',
+    'Charged time', 'Charged account type', 'Charged account name',
+    'Filename', 'Additional instructions',
+    'Special Information (Operator Only) Operator name',
+    'Print Information (DMC staff only) Operator name'
+]
+
 def clean_data(df):
-    """Clean and prepare dataframe"""
-    columns_to_remove = [
-        'room name', 'Room name', 'title', 'Title', 'customer', 'Customer name',
-        'email', 'Email', 'last status update', 'Last status update',
-        'Charged time', 'Charged account type', 'Charged account name',
-        'Filename', 'Additional instructions',
-        'Special Information (Operator Only) Operator name',
-        'Print Information (DMC staff only) Operator name'
-    ]
-
-    columns_found = [col for col in columns_to_remove if col in df.columns]
+    """Clean and prepare dataframe (reassigns columns on df; pass a freshly read frame)"""
+    columns_found = [col for col in COLUMNS_TO_REMOVE if col in df.columns]
     if columns_found:
         df = df.drop(columns=columns_found)
 
     if "Copies" in df.columns:
-        df["Copies"] = pd.to_numeric(df["Copies"], errors="coerce").fillna(0)
+        # Whole counts are stored in the narrowest integer dtype; groupby sums still accumulate in int64
+        df["Copies"] = pd.to_numeric(pd.to_numeric(df["Copies"], errors="coerce").fillna(0), downcast="integer")
     if "Charged" in df.columns:
-        df["Charged"] = df["Charged"].astype(str).str.strip().str.title()
-        df.loc[~df["Charged"].isin(["Yes", "No"]), "Charged"] = "Unknown"
+        # Classify in one vectorized pass straight into a fixed Yes/No/Unknown Categorical
+        charged = np.char.lower(np.char.strip(df["Charged"].astype(str).to_numpy(dtype=str)))
+        df["Charged"] = pd.Categorical(
+            np.where(charged == "yes", "Yes", np.where(charged == "no", "No", "Unknown")),
+            # Alphabetical, as to_categorical would infer, so pivots and legends keep No before Yes
+            categories=["No", "Unknown", "Yes"]
+        )
     if "Charged amount" in df.columns:
         df["Charged amount"] = clean_currency(df["Charged amount"])
     if "Date submitted" in df.columns:
         df["Date submitted"] = pd.to_datetime(df["Date submitted"], errors='coerce')
 
+    # Strip label whitespace once so predicates compare category codes directly
+    for col in CATEGORICAL_COLUMNS:
+        if col != "Charged" and col in df.columns and pd.api.types.is_string_dtype(df[col]):
+            df[col] = df[col].str.strip()
+
+    return to_categorical(df)
+
+def detect_encoding(raw):
+    """Pick the CSV encoding with one strict decode instead of re-parsing per attempt"""
+    try:
+        raw.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        # latin-1 maps every byte, so it always decodes (the old cp1252 retry was unreachable)
+        return 'latin-1'
+
+# Cleaned frames are also persisted as Parquet so a new server process or session
+# uploading the same file skips CSV parsing and keeps the Categorical dtypes.
+PARQUET_CACHE_DIR = os.path.join(tempfile.gettempdir(), "dmc_cache")
+# Bump whenever clean_data changes its output so stale cache files are ignored
+CLEANED_CACHE_VERSION = 7
+# Files kept on disk, matching the frames load_and_clean keeps in memory
+PARQUET_CACHE_MAX_FILES = 8
+
+def parquet_cache_dir():
+    """Owner-only (0700) Parquet cache directory, or None when it can't be secured"""
+    try:
+        os.makedirs(PARQUET_CACHE_DIR, mode=0o700, exist_ok=True)
+        # makedirs' mode is masked by the umask and ignored for an existing directory
+        os.chmod(PARQUET_CACHE_DIR, 0o700)
+        if hasattr(os, "getuid") and os.stat(PARQUET_CACHE_DIR).st_uid != os.getuid():
+            return None
+    except OSError:
+        return None
+    return PARQUET_CACHE_DIR
+
+def evict_parquet_cache(cache_dir):
+    """Delete all but the PARQUET_CACHE_MAX_FILES most recently used cache files"""
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".parquet"):
+            entries.append((entry.stat().st_mtime, entry.path))
+    for _, path in sorted(entries, reverse=True)[PARQUET_CACHE_MAX_FILES:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def file_key(f):
+    """Content digest of an uploaded file, hashed in 1 MiB chunks without copying the buffer"""
+    h = hashlib.blake2b(digest_size=16)
+    f.seek(0)
+    for chunk in iter(lambda: f.read(1 << 20), b''):
+        h.update(chunk)
+    f.seek(0)
+    return h.hexdigest()
+
+def read_cleaned(key, f):
+    """Parse and clean an uploaded CSV, reusing an on-disk Parquet copy when present"""
+    cache_dir = parquet_cache_dir()
+    cache_path = os.path.join(cache_dir, f"v{CLEANED_CACHE_VERSION}_{key}.parquet") if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            df = pd.read_parquet(cache_path, engine='pyarrow')
+            os.utime(cache_path)  # Mark as recently used for eviction
+            return df
+        except (OSError, ImportError, ValueError, TypeError):
+            pass  # Unreadable cache file: rebuild it below
+
+    file_bytes = f.getvalue()
+    encoding = detect_encoding(file_bytes)
+    # Split the header line alone, then let the parser skip the removed columns
+    # entirely. Like pyarrow, keep blank names as "" and drop a leading BOM
+    first_line = file_bytes.split(b"\n", 1)[0].decode(encoding).lstrip("\ufeff")
+    header = next(csv.reader([first_line]), [])
+    keep = [col for col in header if col not in COLUMNS_TO_REMOVE]
+    # pyarrow resolves a repeated name to its first column, so only prune unique headers
+    usecols = keep if len(set(header)) == len(header) else None
+    try:
+        df = pd.read_csv(io.BytesIO(file_bytes), encoding=encoding, engine='pyarrow', usecols=usecols)
+    except pd.errors.ParserError:
+        # pyarrow rejects rows with a missing field; the C engine pads them with NaN.
+        # It also renames blank and repeated headers, so prune by name instead
+        df = pd.read_csv(io.BytesIO(file_bytes), encoding=encoding,
+                         usecols=lambda col: col not in COLUMNS_TO_REMOVE)
+    df = clean_data(df)
+
+    # Best effort: write to a unique 0600 temp file (sessions are threads of one
+    # process) and rename it so readers never see a partial file
+    if cache_path:
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            os.close(fd)
+            df.to_parquet(tmp_path, engine='pyarrow', compression='zstd', index=False)
+            os.replace(tmp_path, cache_path)
+            evict_parquet_cache(cache_dir)
+        except (OSError, ImportError, ValueError, TypeError):
+            if tmp_path:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    return df
+
+# The cleaned frame is shared across reruns (cache_resource skips the pickle
+# round-trip of cache_data), so callers must treat it as read-only. Keyed on the
+# file_key digest; the upload itself is not hashed and is only read on a miss.
+@st.cache_resource(show_spinner=False, ttl=None, max_entries=8)
+def load_and_clean(key, filename, _file):
+    """Read, clean and season-tag an uploaded CSV"""
+    df = read_cleaned(key, _file)
+    df['Season'] = extract_season_from_filename(filename)
     return df
 
+# Keyed on the upload digest(s) the frame was built from; hashing the frame
+# itself costs more than the split and only samples rows on large frames
+@st.cache_resource(show_spinner=False, max_entries=8)
+def split_by_product(key, _df):
+    """Split a cached frame into per-product frames in one groupby pass (shared, read-only)"""
+    return {name: group for name, group in _df.groupby("Product name", observed=True)}
+
+# Keyed on (filename, digest) pairs; the frames themselves are not hashed
+@st.cache_resource(show_spinner=False, max_entries=8)
+def merge_cleaned(file_keys, _frames):
+    """Concatenate per-file cleaned frames into one multi-year frame (shared, read-only)"""
+    # Give every file the same categories per label column so concat stacks the
+    # integer codes instead of falling back to object and re-encoding
+    schema = {}
+    for col in CATEGORICAL_COLUMNS:
+        columns = [frame[col] for frame in _frames if col in frame.columns]
+        if len(columns) != len(_frames) or not all(isinstance(c.dtype, pd.CategoricalDtype) for c in columns):
+            continue
+        # A column left blank in one file has no categories (and float ones), so it
+        # doesn't constrain the schema; union_categoricals rejects mixed category
+        # dtypes, so any other mismatch is left to to_categorical below
+        typed = [c for c in columns if len(c.cat.categories)]
+        if typed and len({c.cat.categories.dtype for c in typed}) == 1:
+            schema[col] = pd.CategoricalDtype(union_categoricals(typed, sort_categories=True).categories)
+    frames = [frame.astype(schema) for frame in _frames]
+
+    # Columns without a shared schema (e.g. Season) are encoded here
+    return to_categorical(pd.concat(frames, ignore_index=True))
+
+# Bytes are immutable, so the payload is shared rather than copied out of cache_data
+@st.cache_resource(show_spinner=False, max_entries=8)
+def csv_bytes(key, _df, exclude=()):
+    """CSV export of a cached frame without the exclude columns, serialized once per upload key"""
+    buf = io.BytesIO()
+    _df.to_csv(buf, columns=[col for col in _df.columns if col not in exclude], index=False)
+    return buf.getvalue()
+
+def charged_counts(charged):
+    """Non-zero order counts per Charged label, largest first, from np.bincount on the codes"""
+    codes = charged.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(charged.cat.categories))
+    counts = pd.Series(counts, index=charged.cat.categories, name="count")
+    return counts[counts > 0].sort_values(ascending=False, kind="stable")
+
+def charged_rate(counts):
+    """Percentage of "Yes" from charged_counts output"""
+    total = counts.sum()
+    return counts.get("Yes", 0) / total * 100 if total else 0.0
+
+# Keyed on the upload digest plus section name rather than id(): frames evicted
+# from the resource caches can hand their id to a different upload's frame.
+@st.cache_data(show_spinner=False, max_entries=64)
+def column_uniques(data_key, col, _df):
+    """Sorted non-null values of a column, used as multiselect options"""
+    return sorted(_df[col].dropna().unique().tolist())
+
+def charged_colors(labels):
+    """Marker colors for Charged labels: Yes green, No red, anything else orange"""
+    labels = np.asarray(labels, dtype=object)
+    colors = np.full(len(labels), '#ff7f0e', dtype=object)
+    colors[labels == 'Yes'] = '#2ca02c'
+    colors[labels == 'No'] = '#d62728'
+    return colors
+
 def apply_filters(df, filters):
-    """Apply interactive filters to dataframe"""
-    filtered_df = df.copy()
+    """Apply interactive filters to dataframe (result must not be mutated)"""
+    if not filters:
+        return df
 
-    for col, values in filters.items():
-        if col in filtered_df.columns and values:
-            filtered_df = filtered_df[filtered_df[col].isin(values)]
+    mask = np.ones(len(df), dtype=bool)
 
-    return filtered_df
+    for col, values in filters.items():
+        if col in df.columns and values:
+            series = df[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                # Gather from a per-category lookup; the trailing False catches NaN code -1
+                keep = np.append(series.cat.categories.isin(values), False)
+                mask &= keep[series.cat.codes.to_numpy()]
+            else:
+                mask &= series.isin(values).to_numpy()
 
-def create_interactive_table(df, columns, title):
-    """Create interactive sortable table"""
-    if len(df) == 0:
-        return None
+    return df.loc[mask]
 
-    display_df = df[columns].copy()
+def sum_matrix(df, index, columns, values="Copies"):
+    """Cross-tab of summed values; groupby+unstack on Categorical codes instead of pivot_table"""
+    return df.groupby([index, columns], observed=True)[values].sum().unstack(fill_value=0)
 
-    # Format numeric columns
-    for col in display_df.columns:
-        if display_df[col].dtype in ['float64', 'int64']:
+def table_column_config(df):
+    """st.dataframe column_config that formats numeric columns in the frontend ($1,234.56 / 1,234)"""
+    column_config = {}
+    for col in df.columns:
+        if pd.api.types.is_numeric_dtype(df[col]):
             if 'amount' in col.lower() or 'revenue' in col.lower():
-                display_df[col] = display_df[col].apply(lambda x: f'${x:,.2f}')
+                column_config[col] = st.column_config.NumberColumn(format="dollar")
             else:
-                display_df[col] = display_df[col].apply(lambda x: f'{int(x):,}')
+                column_config[col] = st.column_config.NumberColumn(format="localized")
+    return column_config
+
+# Upper bound on points per timeline trace sent to the browser
+TIMELINE_MAX_POINTS = 2000
+
+# Bar charts show only the largest categories; tables keep the full ranking
+TOP_N_BARS = 20
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets downsampling: indices of the points to keep"""
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # First and last points are always kept; the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        # Pick the point forming the largest triangle with the previous pick and the next bucket's mean
+        area = np.abs((x[prev] - avg_x) * (y[start:end] - y[prev]) - (x[prev] - x[start:end]) * (avg_y - y[prev]))
+        prev = start + int(area.argmax())
+        keep[i + 1] = prev
+
+    return keep
+
+# Memoized on the hashed revenue series, so reruns with unchanged filters reuse the traces
+@st.cache_data(show_spinner=False, max_entries=32)
+def revenue_bar_figure(revenue):
+    """Revenue-by-product bar chart as a figure dict"""
+    fig = go.Figure()
+
+    fig.add_trace(go.Bar(
+        name='Revenue',
+        x=revenue.index,
+        y=revenue.values,
+        marker_color='#2ca02c',
+        hovertemplate='<b>%{x}</b><br>Revenue: $%{y:,.2f}<br><extra></extra>',
+        texttemplate='$%{y:,.0f}',
+        textposition='outside'
+    ))
 
-    return display_df
+    fig.update_layout(
+        title="Revenue by Product (Click to see details)",
+        xaxis_title="Product",
+        yaxis_title="Revenue ($)",
+        height=400,
+        hovermode='x unified',
+        showlegend=False,
+        plot_bgcolor='rgba(0,0,0,0)',
+        xaxis_tickangle=-45
+    )
+
+    return fig.to_dict()
 
 # ==================== ENHANCED SINGLE YEAR VISUALIZATIONS ====================
+# Each section is a fragment: its filter widgets rerun only that section, with
+# the arguments from the last full run.
 
-def create_overall_visualizations(df):
+@st.fragment
+def create_overall_visualizations(df, data_key):
     """Enhanced overall category visualizations with interactivity"""
     st.markdown('<p class="category-header">📊 OVERALL ANALYSIS</p>', unsafe_allow_html=True)
 
@@ -151,21 +433,21 @@ def create_overall_visualizations(df):
         filters = {}
         with col1:
             if "Order status" in df.columns:
-                status_options = df["Order status"].dropna().unique().tolist()
+                status_options = column_uniques(data_key, "Order status", df)
                 selected_status = st.multiselect("Order Status", status_options, default=status_options, key="overall_status")
                 if selected_status:
                     filters["Order status"] = selected_status
 
         with col2:
             if "Charged" in df.columns:
-                charged_options = df["Charged"].unique().tolist()
+                charged_options = column_uniques(data_key, "Charged", df)
                 selected_charged = st.multiselect("Charged", charged_options, default=charged_options, key="overall_charged")
                 if selected_charged:
                     filters["Charged"] = selected_charged
 
         with col3:
             if "Product name" in df.columns:
-                product_options = df["Product name"].dropna().unique().tolist()
+                product_options = column_uniques(data_key, "Product name", df)
                 selected_products = st.multiselect("Products", product_options, default=product_options, key="overall_products")
                 if selected_products:
                     filters["Product name"] = selected_products
@@ -173,6 +455,10 @@ def create_overall_visualizations(df):
     # Apply filters
     df_filtered = apply_filters(df, filters)
 
+    # One pass over the Charged codes feeds the KPI and both charging sections
+    if "Charged" in df_filtered.columns:
+        count_charged = charged_counts(df_filtered["Charged"])
+
     # Dynamic KPIs with animated delta
     col1, col2, col3, col4 = st.columns(4)
 
@@ -186,21 +472,29 @@ def create_overall_visualizations(df):
             st.metric("📄 Total Copies", f"{int(df_filtered['Copies'].sum()):,}")
     with col4:
         if "Charged" in df_filtered.columns and len(df_filtered) > 0:
-            charged_pct = (df_filtered["Charged"] == "Yes").sum() / len(df_filtered) * 100
+            charged_pct = charged_rate(count_charged)
             st.metric("✅ Charged Rate", f"{charged_pct:.1f}%")
 
     st.markdown("---")
 
+    # Single (product, status) reduction shared by the product tables and the sunburst
+    if "Product name" in df_filtered.columns:
+        group_keys = ["Product name"]
+        if "Order status" in df_filtered.columns:
+            group_keys.append("Order status")
+
+        # dropna=False keeps orders without a status in the per-product totals
+        product_status_agg = df_filtered.groupby(group_keys, observed=True, dropna=False).agg(**{
+            "Charged amount": ("Charged amount", "sum"),
+            "Copies": ("Copies", "sum"),
+            "Order Count": ("Copies", "size")
+        })
+        product_table = product_status_agg.groupby(level="Product name", observed=True).sum()
+
     # Data Table: Product Summary Matrix
     if "Product name" in df_filtered.columns:
         st.markdown("#### 📊 Product Summary Table")
 
-        product_table = df_filtered.groupby("Product name").agg({
-            "Charged amount": "sum",
-            "Copies": "sum",
-            "Product name": "count"
-        }).rename(columns={"Product name": "Order Count"})
-
         # Add total row
         total_row = pd.DataFrame({
             "Charged amount": [product_table["Charged amount"].sum()],
@@ -211,11 +505,8 @@ def create_overall_visualizations(df):
         product_table_display = pd.concat([product_table, total_row])
 
         st.dataframe(
-            product_table_display.style.format({
-                "Charged amount": "${:,.2f}",
-                "Copies": "{:,.0f}",
-                "Order Count": "{:,.0f}"
-            }),
+            product_table_display,
+            column_config=table_column_config(product_table_display),
             use_container_width=True
         )
 
@@ -228,46 +519,17 @@ def create_overall_visualizations(df):
         with col1:
             st.markdown("#### 📋 Interactive Product Summary")
 
-            product_summary = df_filtered.groupby("Product name").agg({
-                "Charged amount": "sum",
-                "Copies": "sum",
-                "Product name": "count"
-            }).rename(columns={"Product name": "Order Count"}).sort_values("Charged amount", ascending=False)
+            product_summary = product_table.sort_values("Charged amount", ascending=False)
 
             # Interactive bar chart with click details
-            fig = go.Figure()
-
-            fig.add_trace(go.Bar(
-                name='Revenue',
-                x=product_summary.index,
-                y=product_summary['Charged amount'],
-                marker_color='#2ca02c',
-                hovertemplate='<b>%{x}</b><br>Revenue: $%{y:,.2f}<br><extra></extra>',
-                text=[f'${x:,.0f}' for x in product_summary['Charged amount']],
-                textposition='outside'
-            ))
-
-            fig.update_layout(
-                title="Revenue by Product (Click to see details)",
-                xaxis_title="Product",
-                yaxis_title="Revenue ($)",
-                height=400,
-                hovermode='x unified',
-                showlegend=False,
-                plot_bgcolor='rgba(0,0,0,0)',
-                xaxis_tickangle=-45
-            )
-
+            fig = go.Figure(revenue_bar_figure(product_summary["Charged amount"].nlargest(TOP_N_BARS)))
             st.plotly_chart(fig, use_container_width=True)
 
         with col2:
             st.markdown("#### 📊 Top Products")
             st.dataframe(
-                product_summary.style.format({
-                    "Charged amount": "${:,.2f}",
-                    "Copies": "{:,.0f}",
-                    "Order Count": "{:,.0f}"
-                }),
+                product_summary,
+                column_config=table_column_config(product_summary),
                 height=400
             )
 
@@ -276,7 +538,12 @@ def create_overall_visualizations(df):
         st.markdown("#### 🌟 Order Distribution (Interactive Sunburst)")
 
         # Create hierarchical data
-        sunburst_data = df_filtered.groupby(["Product name", "Order status"]).size().reset_index(name='Count')
+        sunburst_data = (
+            product_status_agg["Order Count"].rename("Count").reset_index()
+            .dropna(subset=["Product name", "Order status"])
+        )
+        # Only non-empty leaves go to the browser, with compact integer counts
+        sunburst_data = sunburst_data[sunburst_data["Count"] > 0].astype({"Count": "int32"})
 
         fig = px.sunburst(
             sunburst_data,
@@ -294,16 +561,12 @@ def create_overall_visualizations(df):
     if "Charged" in df_filtered.columns:
         st.markdown("#### 📊 Count of Charged Orders")
 
-        count_charged_df = df_filtered["Charged"].value_counts().reset_index()
-        count_charged_df.columns = ["Charged", "Count"]
-
         fig = go.Figure(data=[
             go.Bar(
-                x=count_charged_df["Charged"],
-                y=count_charged_df["Count"],
-                marker_color=['#2ca02c' if x == 'Yes' else '#d62728' if x == 'No' else '#ff7f0e'
-                             for x in count_charged_df["Charged"]],
-                text=count_charged_df["Count"],
+                x=count_charged.index,
+                y=count_charged.values,
+                marker_color=charged_colors(count_charged.index),
+                text=count_charged.values,
                 textposition='outside',
                 hovertemplate='<b>%{x}</b><br>Count: %{y:,}<extra></extra>'
             )
@@ -325,7 +588,9 @@ def create_overall_visualizations(df):
 
         col1, col2 = st.columns(2)
 
-        count_charged = df_filtered["Charged"].value_counts()
+        charged_values = count_charged.to_numpy()
+        charged_total = charged_values.sum()
+        charged_pct = charged_values / charged_total * 100
 
         with col1:
             # Animated bar chart
@@ -333,9 +598,9 @@ def create_overall_visualizations(df):
                 go.Bar(
                     x=count_charged.index,
                     y=count_charged.values,
-                    marker_color=['#2ca02c' if x == 'Yes' else '#d62728' if x == 'No' else '#ff7f0e'
-                                 for x in count_charged.index],
-                    text=[f'{x:,}<br>({x/count_charged.sum()*100:.1f}%)' for x in count_charged.values],
+                    marker_color=charged_colors(count_charged.index),
+                    customdata=charged_pct,
+                    texttemplate='%{y:,}<br>(%{customdata:.1f}%)',
                     textposition='outside',
                     hovertemplate='<b>%{x}</b><br>Count: %{y:,}<br><extra></extra>'
                 )
@@ -360,13 +625,13 @@ def create_overall_visualizations(df):
                 marker_colors=['#2ca02c', '#d62728', '#ff7f0e'],
                 textinfo='label+percent',
                 hovertemplate='<b>%{label}</b><br>Count: %{value:,}<br>Percentage: %{percent}<extra></extra>',
-                pull=[0.1 if x == count_charged.max() else 0 for x in count_charged.values]
+                pull=np.where(charged_values == count_charged.max(), 0.1, 0)
             )])
 
             fig.update_layout(
                 title="Charging Distribution",
                 height=400,
-                annotations=[dict(text=f'{count_charged.sum():,}<br>Total', x=0.5, y=0.5,
+                annotations=[dict(text=f'{charged_total:,}<br>Total', x=0.5, y=0.5,
                                 font_size=20, showarrow=False)]
             )
 
@@ -376,13 +641,18 @@ def create_overall_visualizations(df):
     if "Date submitted" in df_filtered.columns:
         st.markdown("#### 📅 Interactive Timeline")
 
-        df_timeline = df_filtered[df_filtered["Date submitted"].notna()].copy()
+        # Bin on datetime64 days (int64 keys, not Python date objects); NaT rows drop out of the groupby
+        timeline_data = df_filtered.groupby(
+            df_filtered["Date submitted"].dt.floor("D")
+        )[["Copies", "Charged amount"]].sum().reset_index()
 
-        if len(df_timeline) > 0:
-            timeline_data = df_timeline.groupby(df_timeline["Date submitted"].dt.date).agg({
-                "Copies": "sum",
-                "Charged amount": "sum"
-            }).reset_index()
+        if len(timeline_data) > 0:
+            # Downsample long timelines so the browser only receives the shape-defining points
+            day_ns = timeline_data["Date submitted"].to_numpy(dtype="datetime64[ns]").astype("int64")
+            copies_idx = lttb_indices(day_ns, timeline_data["Copies"], TIMELINE_MAX_POINTS)
+            revenue_idx = lttb_indices(day_ns, timeline_data["Charged amount"], TIMELINE_MAX_POINTS)
+            copies_points = timeline_data.iloc[copies_idx]
+            revenue_points = timeline_data.iloc[revenue_idx]
 
             # Create subplot with shared x-axis
             fig = make_subplots(
@@ -393,9 +663,9 @@ def create_overall_visualizations(df):
             )
 
             fig.add_trace(
-                go.Scatter(
-                    x=timeline_data["Date submitted"],
-                    y=timeline_data["Copies"],
+                go.Scattergl(
+                    x=copies_points["Date submitted"],
+                    y=copies_points["Copies"],
                     mode='lines+markers',
                     name='Copies',
                     fill='tozeroy',
@@ -407,9 +677,9 @@ def create_overall_visualizations(df):
             )
 
             fig.add_trace(
-                go.Scatter(
-                    x=timeline_data["Date submitted"],
-                    y=timeline_data["Charged amount"],
+                go.Scattergl(
+                    x=revenue_points["Date submitted"],
+                    y=revenue_points["Charged amount"],
                     mode='lines+markers',
                     name='Revenue',
                     fill='tozeroy',
@@ -432,12 +702,11 @@ def create_overall_visualizations(df):
 
             st.plotly_chart(fig, use_container_width=True)
 
-def create_3d_print_visualizations(df):
+@st.fragment
+def create_3d_print_visualizations(df3d, data_key):
     """Enhanced 3D Print visualizations"""
     st.markdown('<p class="category-header">🖨️ 3D PRINT ANALYSIS</p>', unsafe_allow_html=True)
 
-    df3d = df[df["Product name"].str.strip() == "3D Print"].copy()
-
     if len(df3d) == 0:
         st.warning("No 3D Print data found")
         return
@@ -449,21 +718,21 @@ def create_3d_print_visualizations(df):
         filters = {}
         with col1:
             if "Material name" in df3d.columns:
-                materials = df3d["Material name"].dropna().unique().tolist()
+                materials = column_uniques(data_key, "Material name", df3d)
                 selected_materials = st.multiselect("Materials", materials, default=materials, key="3d_materials")
                 if selected_materials:
                     filters["Material name"] = selected_materials
 
         with col2:
             if "Special Information (Operator Only) Machine" in df3d.columns:
-                machines = df3d["Special Information (Operator Only) Machine"].dropna().unique().tolist()
+                machines = column_uniques(data_key, "Special Information (Operator Only) Machine", df3d)
                 selected_machines = st.multiselect("Machines", machines, default=machines, key="3d_machines")
                 if selected_machines:
                     filters["Special Information (Operator Only) Machine"] = selected_machines
 
         with col3:
             if "Special Information (Operator Only) Job difficulty" in df3d.columns:
-                difficulties = df3d["Special Information (Operator Only) Job difficulty"].dropna().unique().tolist()
+                difficulties = column_uniques(data_key, "Special Information (Operator Only) Job difficulty", df3d)
                 selected_diff = st.multiselect("Job Difficulty", difficulties, default=difficulties, key="3d_diff")
                 if selected_diff:
                     filters["Special Information (Operator Only) Job difficulty"] = selected_diff
@@ -484,10 +753,13 @@ def create_3d_print_visualizations(df):
     if "Material name" in df3d_filtered.columns:
         st.markdown("#### 📋 Material Summary Table")
 
-        material_table = df3d_filtered.groupby("Material name").agg({
-            "Copies": "sum",
-            "Charged amount": "sum"
+        # One pass feeds both the summary table and the material chart below
+        material_data = df3d_filtered.groupby("Material name", observed=True).agg(**{
+            "Copies": ("Copies", "sum"),
+            "Charged amount": ("Charged amount", "sum"),
+            "Orders": ("Copies", "size")
         }).sort_values("Copies", ascending=False)
+        material_table = material_data[["Copies", "Charged amount"]]
 
         # Add total row
         total_row = pd.DataFrame({
@@ -498,10 +770,8 @@ def create_3d_print_visualizations(df):
         material_table_display = pd.concat([material_table, total_row])
 
         st.dataframe(
-            material_table_display.style.format({
-                "Copies": "{:,.0f}",
-                "Charged amount": "${:,.2f}"
-            }),
+            material_table_display,
+            column_config=table_column_config(material_table_display),
             use_container_width=True
         )
 
@@ -509,30 +779,25 @@ def create_3d_print_visualizations(df):
     if "Material name" in df3d_filtered.columns:
         st.markdown("#### 🧱 Material Usage Analysis")
 
-        material_data = df3d_filtered.groupby("Material name").agg({
-            "Copies": "sum",
-            "Charged amount": "sum",
-            "Material name": "count"
-        }).rename(columns={"Material name": "Orders"}).sort_values("Copies", ascending=False)
-
         col1, col2 = st.columns([2, 1])
 
         with col1:
             # 3D bar chart
+            material_top = material_data.nlargest(TOP_N_BARS, "Copies")
             fig = go.Figure(data=[
                 go.Bar(
-                    x=material_data.index,
-                    y=material_data['Copies'],
+                    x=material_top.index,
+                    y=material_top['Copies'],
                     marker=dict(
-                        color=material_data['Copies'],
+                        color=material_top['Copies'],
                         colorscale='Viridis',
                         showscale=True,
                         colorbar=dict(title="Copies")
                     ),
-                    text=[f'{int(x):,}' for x in material_data['Copies']],
+                    texttemplate='%{y:,}',
                     textposition='outside',
                     hovertemplate='<b>%{x}</b><br>Copies: %{y:,}<br>Revenue: $%{customdata:,.2f}<extra></extra>',
-                    customdata=material_data['Charged amount']
+                    customdata=material_top['Charged amount']
                 )
             ])
 
@@ -549,11 +814,8 @@ def create_3d_print_visualizations(df):
         with col2:
             st.markdown("**Material Statistics**")
             st.dataframe(
-                material_data.style.format({
-                    "Copies": "{:,.0f}",
-                    "Charged amount": "${:,.2f}",
-                    "Orders": "{:,.0f}"
-                }),
+                material_data,
+                column_config=table_column_config(material_data),
                 height=400
             )
 
@@ -562,7 +824,7 @@ def create_3d_print_visualizations(df):
         st.markdown("#### ⚙️ Job Difficulty Analysis")
 
         job_col = "Special Information (Operator Only) Job difficulty"
-        job_data = df3d_filtered[df3d_filtered[job_col].notna()].groupby(job_col)["Copies"].sum().sort_values(ascending=False)
+        job_data = df3d_filtered[df3d_filtered[job_col].notna()].groupby(job_col, observed=True)["Copies"].sum().sort_values(ascending=False)
 
         # Create funnel chart
         fig = go.Figure(go.Funnel(
@@ -585,11 +847,9 @@ def create_3d_print_visualizations(df):
         st.markdown("#### 🤖 Machine Usage (Interactive Treemap)")
 
         machine_data = df3d_filtered[df3d_filtered["Special Information (Operator Only) Machine"].notna()].groupby(
-            "Special Information (Operator Only) Machine"
-        ).agg({
-            "Copies": "sum",
-            "Charged amount": "sum"
-        }).reset_index()
+            "Special Information (Operator Only) Machine", observed=True
+        )[["Copies", "Charged amount"]].sum().reset_index()
+        machine_data = machine_data[machine_data["Copies"] > 0]
 
         fig = px.treemap(
             machine_data,
@@ -608,14 +868,16 @@ def create_3d_print_visualizations(df):
     if "Order status" in df3d_filtered.columns:
         st.markdown("#### 📋 Order Status Distribution")
 
-        status_data = df3d_filtered.groupby("Order status")["Copies"].sum().sort_values(ascending=False)
+        # One status reduction shared with the clustered chart below
+        status_copies = df3d_filtered.groupby("Order status", observed=True)["Copies"].sum()
+        status_data = status_copies.sort_values(ascending=False)
 
         fig = go.Figure(data=[
             go.Bar(
                 x=status_data.index,
                 y=status_data.values,
                 marker_color='#9467bd',
-                text=[f'{int(x):,}' for x in status_data.values],
+                texttemplate='%{y:,}',
                 textposition='outside',
                 hovertemplate='<b>%{x}</b><br>Copies: %{y:,}<extra></extra>'
             )
@@ -636,18 +898,15 @@ def create_3d_print_visualizations(df):
     if "Order status" in df3d_filtered.columns:
         st.markdown("#### 📊 Copies by Product Name and Order Status")
 
-        status_product = df3d_filtered.groupby("Order status")["Copies"].sum().reset_index()
-
         # Create grouped bar chart
         fig = go.Figure()
 
-        for status in status_product["Order status"].unique():
-            status_df = status_product[status_product["Order status"] == status]
+        for status, copies in status_copies.items():
             fig.add_trace(go.Bar(
                 name=status,
                 x=["3D Print"],
-                y=status_df["Copies"],
-                text=[f'{int(x):,}' for x in status_df["Copies"]],
+                y=[copies],
+                texttemplate='%{y:,}',
                 textposition='outside',
                 hovertemplate=f'<b>{status}</b><br>Product: 3D Print<br>Copies: %{{y:,}}<extra></extra>'
             ))
@@ -664,12 +923,11 @@ def create_3d_print_visualizations(df):
 
         st.plotly_chart(fig, use_container_width=True)
 
-def create_document_visualizations(df):
+@st.fragment
+def create_document_visualizations(df_doc, data_key):
     """Enhanced Document visualizations"""
     st.markdown('<p class="category-header">📄 DOCUMENT ANALYSIS</p>', unsafe_allow_html=True)
 
-    df_doc = df[df["Product name"].str.strip() == "Document"].copy()
-
     if len(df_doc) == 0:
         st.warning("No Document data found")
         return
@@ -681,21 +939,21 @@ def create_document_visualizations(df):
         filters = {}
         with col1:
             if "Paper type" in df_doc.columns:
-                paper_types = df_doc["Paper type"].dropna().unique().tolist()
+                paper_types = column_uniques(data_key, "Paper type", df_doc)
                 selected_types = st.multiselect("Paper Type", paper_types, default=paper_types, key="doc_paper_type")
                 if selected_types:
                     filters["Paper type"] = selected_types
 
         with col2:
             if "Paper size" in df_doc.columns:
-                sizes = df_doc["Paper size"].dropna().unique().tolist()
+                sizes = column_uniques(data_key, "Paper size", df_doc)
                 selected_sizes = st.multiselect("Paper Size", sizes, default=sizes, key="doc_size")
                 if selected_sizes:
                     filters["Paper size"] = selected_sizes
 
         with col3:
             if "Single or double sided" in df_doc.columns:
-                sided = df_doc["Single or double sided"].dropna().unique().tolist()
+                sided = column_uniques(data_key, "Single or double sided", df_doc)
                 selected_sided = st.multiselect("Sides", sided, default=sided, key="doc_sided")
                 if selected_sided:
                     filters["Single or double sided"] = selected_sided
@@ -716,16 +974,13 @@ def create_document_visualizations(df):
     if "Paper type" in df_doc_filtered.columns and "Paper size" in df_doc_filtered.columns:
         st.markdown("#### 📋 Document Summary Table")
 
-        doc_table = df_doc_filtered.groupby(["Paper type", "Paper size"]).agg({
-            "Copies": "sum",
-            "Charged amount": "sum"
-        }).sort_values("Copies", ascending=False)
+        doc_table = df_doc_filtered.groupby(
+            ["Paper type", "Paper size"], observed=True
+        )[["Copies", "Charged amount"]].sum().sort_values("Copies", ascending=False)
 
         st.dataframe(
-            doc_table.style.format({
-                "Copies": "{:,.0f}",
-                "Charged amount": "${:,.2f}"
-            }),
+            doc_table,
+            column_config=table_column_config(doc_table),
             use_container_width=True
         )
 
@@ -733,7 +988,7 @@ def create_document_visualizations(df):
     if "Paper type" in df_doc_filtered.columns:
         st.markdown("#### 📑 Copies by Paper Type")
 
-        paper_type_data = df_doc_filtered.groupby("Paper type")["Copies"].sum().sort_values(ascending=False)
+        paper_type_data = df_doc_filtered.groupby("Paper type", observed=True)["Copies"].sum().sort_values(ascending=False)
 
         fig = go.Figure(data=[
             go.Bar(
@@ -745,7 +1000,7 @@ def create_document_visualizations(df):
                     showscale=True,
                     colorbar=dict(title="Copies")
                 ),
-                text=[f'{int(x):,}' for x in paper_type_data.values],
+                texttemplate='%{y:,}',
                 textposition='outside',
                 hovertemplate='<b>%{x}</b><br>Copies: %{y:,}<extra></extra>'
             )
@@ -765,7 +1020,7 @@ def create_document_visualizations(df):
     if "Paper size" in df_doc_filtered.columns:
         st.markdown("#### 📏 Copies by Paper Size")
 
-        paper_size_data = df_doc_filtered.groupby("Paper size")["Copies"].sum().sort_values(ascending=False)
+        paper_size_data = df_doc_filtered.groupby("Paper size", observed=True)["Copies"].sum().sort_values(ascending=False)
 
         fig = go.Figure(data=[
             go.Bar(
@@ -778,7 +1033,7 @@ def create_document_visualizations(df):
                     showscale=True,
                     colorbar=dict(title="Copies")
                 ),
-                text=[f'{int(x):,}' for x in paper_size_data.values],
+                texttemplate='%{x:,}',
                 textposition='outside',
                 hovertemplate='<b>%{y}</b><br>Copies: %{x:,}<extra></extra>'
             )
@@ -798,13 +1053,9 @@ def create_document_visualizations(df):
     if "Paper type" in df_doc_filtered.columns and "Paper size" in df_doc_filtered.columns:
         st.markdown("#### 📋 Paper Type & Size Matrix")
 
-        paper_matrix = df_doc_filtered.pivot_table(
-            values="Copies",
-            index="Paper type",
-            columns="Paper size",
-            aggfunc="sum",
-            fill_value=0
-        )
+        paper_matrix = sum_matrix(df_doc_filtered, "Paper type", "Paper size")
+        # Drop all-zero columns so empty traces are not serialized
+        paper_matrix = paper_matrix.loc[:, paper_matrix.sum() > 0]
 
         fig = go.Figure()
 
@@ -813,7 +1064,7 @@ def create_document_visualizations(df):
                 name=str(col),
                 x=paper_matrix.index,
                 y=paper_matrix[col],
-                text=[f'{int(x):,}' if x > 0 else '' for x in paper_matrix[col]],
+                texttemplate=np.where(paper_matrix[col] > 0, '%{y:,}', ''),
                 textposition='auto',
                 hovertemplate='<b>%{x}</b><br>Size: ' + str(col) + '<br>Copies: %{y:,}<extra></extra>'
             ))
@@ -836,10 +1087,9 @@ def create_document_visualizations(df):
 
         col1, col2 = st.columns([1, 1])
 
-        sided_data = df_doc_filtered.groupby("Single or double sided").agg({
-            "Copies": "sum",
-            "Charged amount": "sum"
-        })
+        sided_data = df_doc_filtered.groupby(
+            "Single or double sided", observed=True
+        )[["Copies", "Charged amount"]].sum()
 
         with col1:
             fig = go.Figure(data=[go.Pie(
@@ -885,14 +1135,16 @@ def create_document_visualizations(df):
     if "Order status" in df_doc_filtered.columns:
         st.markdown("#### 📋 Order Status Distribution")
 
-        status_data = df_doc_filtered.groupby("Order status")["Copies"].sum().sort_values(ascending=False)
+        # One status reduction shared with the clustered chart below
+        status_copies = df_doc_filtered.groupby("Order status", observed=True)["Copies"].sum()
+        status_data = status_copies.sort_values(ascending=False)
 
         fig = go.Figure(data=[
             go.Bar(
                 x=status_data.index,
                 y=status_data.values,
                 marker_color='#ff7f0e',
-                text=[f'{int(x):,}' for x in status_data.values],
+                texttemplate='%{y:,}',
                 textposition='outside',
                 hovertemplate='<b>%{x}</b><br>Copies: %{y:,}<extra></extra>'
             )
@@ -913,18 +1165,15 @@ def create_document_visualizations(df):
     if "Order status" in df_doc_filtered.columns:
         st.markdown("#### 📊 Copies by Product Name and Order Status")
 
-        status_product = df_doc_filtered.groupby("Order status")["Copies"].sum().reset_index()
-
         # Create grouped bar chart
         fig = go.Figure()
 
-        for status in status_product["Order status"].unique():
-            status_df = status_product[status_product["Order status"] == status]
+        for status, copies in status_copies.items():
             fig.add_trace(go.Bar(
                 name=status,
                 x=["Document"],
-                y=status_df["Copies"],
-                text=[f'{int(x):,}' for x in status_df["Copies"]],
+                y=[copies],
+                texttemplate='%{y:,}',
                 textposition='outside',
                 hovertemplate=f'<b>{status}</b><br>Product: Document<br>Copies: %{{y:,}}<extra></extra>'
             ))
@@ -941,12 +1190,11 @@ def create_document_visualizations(df):
 
         st.plotly_chart(fig, use_container_width=True)
 
-def create_poster_visualizations(df):
+@st.fragment
+def create_poster_visualizations(df_poster, data_key):
     """Enhanced Poster visualizations"""
     st.markdown('<p class="category-header">🖼️ LARGE FORMAT POSTER ANALYSIS</p>', unsafe_allow_html=True)
 
-    df_poster = df[df["Product name"].str.strip() == "Large-Format Poster"].copy()
-
     if len(df_poster) == 0:
         st.warning("No Large-Format Poster data found")
         return
@@ -958,14 +1206,14 @@ def create_poster_visualizations(df):
         filters = {}
         with col1:
             if "Paper size" in df_poster.columns:
-                sizes = df_poster["Paper size"].dropna().unique().tolist()
+                sizes = column_uniques(data_key, "Paper size", df_poster)
                 selected_sizes = st.multiselect("Poster Size", sizes, default=sizes, key="poster_size")
                 if selected_sizes:
                     filters["Paper size"] = selected_sizes
 
         with col2:
             if "Paper color" in df_poster.columns:
-                colors = df_poster["Paper color"].dropna().unique().tolist()
+                colors = column_uniques(data_key, "Paper color", df_poster)
                 selected_colors = st.multiselect("Paper Color", colors, default=colors, key="poster_color")
                 if selected_colors:
                     filters["Paper color"] = selected_colors
@@ -986,10 +1234,9 @@ def create_poster_visualizations(df):
     if "Paper size" in df_poster_filtered.columns:
         st.markdown("#### 📋 Poster Summary Table")
 
-        poster_table = df_poster_filtered.groupby("Paper size").agg({
-            "Copies": "sum",
-            "Charged amount": "sum"
-        }).sort_values("Copies", ascending=False)
+        poster_table = df_poster_filtered.groupby(
+            "Paper size", observed=True
+        )[["Copies", "Charged amount"]].sum().sort_values("Copies", ascending=False)
 
         # Add total row
         total_row = pd.DataFrame({
@@ -1000,10 +1247,8 @@ def create_poster_visualizations(df):
         poster_table_display = pd.concat([poster_table, total_row])
 
         st.dataframe(
-            poster_table_display.style.format({
-                "Copies": "{:,.0f}",
-                "Charged amount": "${:,.2f}"
-            }),
+            poster_table_display,
+            column_config=table_column_config(poster_table_display),
             use_container_width=True
         )
 
@@ -1011,7 +1256,7 @@ def create_poster_visualizations(df):
     if "Paper size" in df_poster_filtered.columns:
         st.markdown("#### 📏 Copies by Product Name and Paper Size (Clustered)")
 
-        size_data = df_poster_filtered.groupby("Paper size")["Copies"].sum().sort_values(ascending=False)
+        size_data = df_poster_filtered.groupby("Paper size", observed=True)["Copies"].sum().sort_values(ascending=False)
 
         # Create grouped bar chart
         fig = go.Figure()
@@ -1021,7 +1266,7 @@ def create_poster_visualizations(df):
                 name=size,
                 x=["Large-Format Poster"],
                 y=[size_data[size]],
-                text=[f'{int(size_data[size]):,}'],
+                texttemplate='%{y:,}',
                 textposition='outside',
                 hovertemplate=f'<b>{size}</b><br>Product: Large-Format Poster<br>Copies: %{{y:,}}<extra></extra>'
             ))
@@ -1042,13 +1287,9 @@ def create_poster_visualizations(df):
     if "Paper size" in df_poster_filtered.columns and "Paper color" in df_poster_filtered.columns:
         st.markdown("#### 📏 Size & Color Matrix (Stacked)")
 
-        size_color_data = df_poster_filtered.pivot_table(
-            values="Copies",
-            index="Paper size",
-            columns="Paper color",
-            aggfunc="sum",
-            fill_value=0
-        )
+        size_color_data = sum_matrix(df_poster_filtered, "Paper size", "Paper color")
+        # Drop all-zero columns so empty traces are not serialized
+        size_color_data = size_color_data.loc[:, size_color_data.sum() > 0]
 
         fig = go.Figure()
 
@@ -1057,7 +1298,7 @@ def create_poster_visualizations(df):
                 name=str(col),
                 x=size_color_data.index,
                 y=size_color_data[col],
-                text=[f'{int(x):,}' if x > 0 else '' for x in size_color_data[col]],
+                texttemplate=np.where(size_color_data[col] > 0, '%{y:,}', ''),
                 textposition='auto',
                 hovertemplate='<b>%{x}</b><br>' + str(col) + '<br>Copies: %{y:,}<extra></extra>'
             ))
@@ -1078,7 +1319,7 @@ def create_poster_visualizations(df):
     if "Paper size" in df_poster_filtered.columns and "Charged amount" in df_poster_filtered.columns:
         st.markdown("#### 💰 Revenue Heatmap by Size")
 
-        revenue_by_size = df_poster_filtered.groupby("Paper size")["Charged amount"].sum().sort_values(ascending=False)
+        revenue_by_size = df_poster_filtered.groupby("Paper size", observed=True)["Charged amount"].sum().nlargest(TOP_N_BARS)
 
         fig = go.Figure(data=go.Bar(
             y=revenue_by_size.index,
@@ -1090,7 +1331,7 @@ def create_poster_visualizations(df):
                 showscale=True,
                 colorbar=dict(title="Revenue ($)")
             ),
-            text=[f'${x:,.0f}' for x in revenue_by_size.values],
+            texttemplate='$%{x:,.0f}',
             textposition='outside',
             hovertemplate='<b>%{y}</b><br>Revenue: $%{x:,.2f}<extra></extra>'
         ))
@@ -1108,7 +1349,7 @@ def create_poster_visualizations(df):
     if "Paper color" in df_poster_filtered.columns:
         st.markdown("#### 🎨 Paper Color Distribution")
 
-        color_data = df_poster_filtered.groupby("Paper color")["Copies"].sum().sort_values(ascending=False)
+        color_data = df_poster_filtered.groupby("Paper color", observed=True)["Copies"].sum().sort_values(ascending=False)
 
         fig = go.Figure(data=[
             go.Bar(
@@ -1129,9 +1370,9 @@ def create_poster_visualizations(df):
                 y=["Large-Format Poster"],
                 x=[value],
                 orientation='h',
-                text=f'{int(value):,}',
+                texttemplate='%{x:,}',
                 textposition='inside',
-                hovertemplate=f'<b>{color}</b><br>Copies: {int(value):,}<extra></extra>'
+                hovertemplate=f'<b>{color}</b><br>Copies: %{{x:,}}<extra></extra>'
             ))
 
         fig.update_layout(
@@ -1150,7 +1391,7 @@ def create_poster_visualizations(df):
     if "Order status" in df_poster_filtered.columns:
         st.markdown("#### 📋 Order Status Distribution")
 
-        status_data = df_poster_filtered.groupby("Order status")["Copies"].sum().sort_values(ascending=True)
+        status_data = df_poster_filtered.groupby("Order status", observed=True)["Copies"].sum().sort_values(ascending=True)
 
         fig = go.Figure(data=[
             go.Bar(
@@ -1158,7 +1399,7 @@ def create_poster_visualizations(df):
                 x=status_data.values,
                 orientation='h',
                 marker_color='#8c564b',
-                text=[f'{int(x):,}' for x in status_data.values],
+                texttemplate='%{x:,}',
                 textposition='outside',
                 hovertemplate='<b>%{y}</b><br>Copies: %{x:,}<extra></extra>'
             )
@@ -1178,19 +1419,16 @@ def create_poster_visualizations(df):
     if "Order status" in df_poster_filtered.columns:
         st.markdown("#### 📊 Copies by Product Name and Order Status")
 
-        status_product = df_poster_filtered.groupby("Order status")["Copies"].sum().sort_values(ascending=True).reset_index()
-
-        # Create grouped horizontal bar chart
+        # Create grouped horizontal bar chart (reuses status_data from above)
         fig = go.Figure()
 
-        for status in status_product["Order status"].unique():
-            status_df = status_product[status_product["Order status"] == status]
+        for status, copies in status_data.items():
             fig.add_trace(go.Bar(
                 name=status,
                 y=["Large-Format Poster"],
-                x=status_df["Copies"],
+                x=[copies],
                 orientation='h',
-                text=[f'{int(x):,}' for x in status_df["Copies"]],
+                texttemplate='%{x:,}',
                 textposition='outside',
                 hovertemplate=f'<b>{status}</b><br>Product: Large-Format Poster<br>Copies: %{{x:,}}<extra></extra>'
             ))
@@ -1233,10 +1471,13 @@ def create_overall_comparison(df):
 
     df_filtered = df[df["Season"].isin(selected_seasons)]
 
+    # One pass over Season feeds every per-season total below
+    season_totals = df_filtered.groupby("Season", observed=True)[["Copies", "Charged amount"]].sum()
+
     # Animated Revenue Comparison
     st.markdown("#### 💰 Revenue Comparison Across Seasons")
 
-    revenue_by_season = df_filtered.groupby("Season")["Charged amount"].sum()
+    revenue_by_season = season_totals["Charged amount"]
 
     fig = go.Figure()
 
@@ -1249,7 +1490,7 @@ def create_overall_comparison(df):
             showscale=True,
             colorbar=dict(title="Revenue ($)")
         ),
-        text=[f'${x:,.0f}' for x in revenue_by_season.values],
+        texttemplate='$%{y:,.0f}',
         textposition='outside',
         hovertemplate='<b>%{x}</b><br>Revenue: $%{y:,.2f}<extra></extra>'
     ))
@@ -1274,35 +1515,31 @@ def create_overall_comparison(df):
             status_chart_type = st.radio("Chart Type", ["Grouped", "Stacked"], key="status_chart_type")
 
         with col2:
-            status_pivot = df_filtered.pivot_table(
-                values="Copies",
-                index="Season",
-                columns="Order status",
-                aggfunc="sum",
-                fill_value=0
-            )
-
-            fig = go.Figure()
-
-            for status in status_pivot.columns:
-                fig.add_trace(go.Bar(
-                    name=status,
-                    x=status_pivot.index,
-                    y=status_pivot[status],
-                    text=[f'{int(x):,}' if x > 0 else '' for x in status_pivot[status]],
-                    textposition='auto',
-                    hovertemplate=f'<b>{status}</b><br>Season: %{{x}}<br>Copies: %{{y:,}}<extra></extra>'
-                ))
-
-            fig.update_layout(
-                barmode='group' if status_chart_type == "Grouped" else 'stack',
-                xaxis_title="Season",
-                yaxis_title="Copies",
-                height=450,
-                hovermode='x unified',
-                legend_title="Order Status",
-                title="Sum of Copies by Season and Order Status"
-            )
+            status_pivot = sum_matrix(df_filtered, "Season", "Order status")
+
+            fig = go.Figure(dict(
+                data=[
+                    dict(
+                        type='bar',
+                        name=status,
+                        x=status_pivot.index,
+                        y=status_pivot[status],
+                        texttemplate=np.where(status_pivot[status] > 0, '%{y:,}', ''),
+                        textposition='auto',
+                        hovertemplate=f'<b>{status}</b><br>Season: %{{x}}<br>Copies: %{{y:,}}<extra></extra>'
+                    )
+                    for status in status_pivot.columns
+                ],
+                layout=dict(
+                    barmode='group' if status_chart_type == "Grouped" else 'stack',
+                    xaxis_title="Season",
+                    yaxis_title="Copies",
+                    height=450,
+                    hovermode='x unified',
+                    legend_title="Order Status",
+                    title="Sum of Copies by Season and Order Status"
+                )
+            ))
 
             st.plotly_chart(fig, use_container_width=True)
 
@@ -1316,34 +1553,30 @@ def create_overall_comparison(df):
             chart_type = st.radio("Chart Type", ["Grouped", "Stacked"], key="product_chart_type")
 
         with col2:
-            pivot_data = df_filtered.pivot_table(
-                values="Copies",
-                index="Season",
-                columns="Product name",
-                aggfunc="sum",
-                fill_value=0
-            )
-
-            fig = go.Figure()
-
-            for product in pivot_data.columns:
-                fig.add_trace(go.Bar(
-                    name=product,
-                    x=pivot_data.index,
-                    y=pivot_data[product],
-                    text=[f'{int(x):,}' if x > 0 else '' for x in pivot_data[product]],
-                    textposition='auto',
-                    hovertemplate=f'<b>{product}</b><br>Season: %{{x}}<br>Copies: %{{y:,}}<extra></extra>'
-                ))
-
-            fig.update_layout(
-                barmode='group' if chart_type == "Grouped" else 'stack',
-                xaxis_title="Season",
-                yaxis_title="Copies",
-                height=450,
-                hovermode='x unified',
-                legend_title="Product"
-            )
+            pivot_data = sum_matrix(df_filtered, "Season", "Product name")
+
+            fig = go.Figure(dict(
+                data=[
+                    dict(
+                        type='bar',
+                        name=product,
+                        x=pivot_data.index,
+                        y=pivot_data[product],
+                        texttemplate=np.where(pivot_data[product] > 0, '%{y:,}', ''),
+                        textposition='auto',
+                        hovertemplate=f'<b>{product}</b><br>Season: %{{x}}<br>Copies: %{{y:,}}<extra></extra>'
+                    )
+                    for product in pivot_data.columns
+                ],
+                layout=dict(
+                    barmode='group' if chart_type == "Grouped" else 'stack',
+                    xaxis_title="Season",
+                    yaxis_title="Copies",
+                    height=450,
+                    hovermode='x unified',
+                    legend_title="Product"
+                )
+            ))
 
             st.plotly_chart(fig, use_container_width=True)
 
@@ -1351,46 +1584,43 @@ def create_overall_comparison(df):
     if "Charged" in df_filtered.columns:
         st.markdown("#### 💳 Charged Status Distribution by Season")
 
-        charged_pivot = df_filtered.pivot_table(
-            values="Copies",
-            index="Season",
-            columns="Charged",
-            aggfunc="sum",
-            fill_value=0
-        )
-
-        fig = go.Figure()
+        charged_pivot = sum_matrix(df_filtered, "Season", "Charged")
 
         colors_map = {"Yes": "#2ca02c", "No": "#d62728", "Unknown": "#ff7f0e"}
 
-        for col in charged_pivot.columns:
-            fig.add_trace(go.Bar(
-                name=col,
-                y=charged_pivot.index,
-                x=charged_pivot[col],
-                orientation='h',
-                marker_color=colors_map.get(col, "#1f77b4"),
-                text=[f'{int(x):,}' if x > 0 else '' for x in charged_pivot[col]],
-                textposition='inside',
-                hovertemplate=f'<b>{col}</b><br>Season: %{{y}}<br>Copies: %{{x:,}}<extra></extra>'
-            ))
-
-        fig.update_layout(
-            barmode='stack',
-            title="Sum of Copies by Season and Charged Status (Stacked)",
-            xaxis_title="Sum of Copies",
-            yaxis_title="Season",
-            height=400,
-            hovermode='y unified',
-            legend_title="Charged"
-        )
+        fig = go.Figure(dict(
+            data=[
+                dict(
+                    type='bar',
+                    name=col,
+                    y=charged_pivot.index,
+                    x=charged_pivot[col],
+                    orientation='h',
+                    marker_color=colors_map.get(col, "#1f77b4"),
+                    texttemplate=np.where(charged_pivot[col] > 0, '%{x:,}', ''),
+                    textposition='inside',
+                    hovertemplate=f'<b>{col}</b><br>Season: %{{y}}<br>Copies: %{{x:,}}<extra></extra>'
+                )
+                for col in charged_pivot.columns
+            ],
+            layout=dict(
+                barmode='stack',
+                title="Sum of Copies by Season and Charged Status (Stacked)",
+                xaxis_title="Sum of Copies",
+                yaxis_title="Season",
+                height=400,
+                hovermode='y unified',
+                legend_title="Charged"
+            )
+        ))
 
         st.plotly_chart(fig, use_container_width=True)
 
     # Season Distribution - Enhanced Pie
     st.markdown("#### 📈 Copies Distribution by Season")
 
-    copies_by_season = df_filtered.groupby("Season")["Copies"].sum()
+    copies_by_season = season_totals["Copies"]
+    season_copies = copies_by_season.to_numpy()
 
     fig = go.Figure(data=[go.Pie(
         labels=copies_by_season.index,
@@ -1402,33 +1632,34 @@ def create_overall_comparison(df):
             colors=px.colors.qualitative.Set3,
             line=dict(color='white', width=2)
         ),
-        pull=[0.1 if x == copies_by_season.max() else 0 for x in copies_by_season.values]
+        pull=np.where(season_copies == season_copies.max(), 0.1, 0)
     )])
 
     fig.update_layout(
         height=500,
         annotations=[dict(
-            text=f'{copies_by_season.sum():,.0f}<br>Total<br>Copies',
+            text=f'{season_copies.sum():,.0f}<br>Total<br>Copies',
             x=0.5, y=0.5, font_size=18, showarrow=False
         )]
     )
 
     st.plotly_chart(fig, use_container_width=True)
 
-def create_3d_print_comparison(df):
+def create_3d_print_comparison(df3d):
     """Enhanced 3D Print comparison"""
     st.markdown('<p class="category-header">🖨️ 3D PRINT COMPARISON</p>', unsafe_allow_html=True)
 
-    df3d = df[df["Product name"].str.strip() == "3D Print"].copy()
-
     if len(df3d) == 0:
         st.warning("No 3D Print data found")
         return
 
+    # One pass over Season feeds every per-season total below
+    season_totals = df3d.groupby("Season", observed=True)[["Copies", "Charged amount"]].sum()
+
     # Simple Copies by Season
     st.markdown("#### 📦 Copies by Season and Product Name")
 
-    season_copies = df3d.groupby("Season")["Copies"].sum().sort_index()
+    season_copies = season_totals["Copies"]
 
     col1, col2 = st.columns(2)
 
@@ -1443,7 +1674,7 @@ def create_3d_print_comparison(df):
                     showscale=True,
                     colorbar=dict(title="Copies")
                 ),
-                text=[f'{int(x):,}' for x in season_copies.values],
+                texttemplate='%{y:,}',
                 textposition='outside',
                 hovertemplate='<b>%{x}</b><br>Copies: %{y:,}<extra></extra>'
             )
@@ -1463,7 +1694,7 @@ def create_3d_print_comparison(df):
     with col2:
         st.markdown("#### 💰 Charged Amount by Season and Product Name")
 
-        season_amount = df3d.groupby("Season")["Charged amount"].sum().sort_index()
+        season_amount = season_totals["Charged amount"]
 
         fig = go.Figure(data=[
             go.Bar(
@@ -1475,7 +1706,7 @@ def create_3d_print_comparison(df):
                     showscale=True,
                     colorbar=dict(title="Revenue ($)")
                 ),
-                text=[f'${x:,.0f}' for x in season_amount.values],
+                texttemplate='$%{y:,.0f}',
                 textposition='outside',
                 hovertemplate='<b>%{x}</b><br>Revenue: $%{y:,.2f}<extra></extra>'
             )
@@ -1494,10 +1725,7 @@ def create_3d_print_comparison(df):
     # Dual axis chart - Copies and Revenue
     st.markdown("#### 📊 Copies & Revenue Trend (Dual Axis)")
 
-    season_data = df3d.groupby("Season").agg({
-        "Copies": "sum",
-        "Charged amount": "sum"
-    })
+    season_data = season_totals
 
     fig = make_subplots(specs=[[{"secondary_y": True}]])
 
@@ -1507,7 +1735,7 @@ def create_3d_print_comparison(df):
             x=season_data.index,
             y=season_data["Copies"],
             marker_color='#9467bd',
-            text=[f'{int(x):,}' for x in season_data["Copies"]],
+            texttemplate='%{y:,}',
             textposition='outside',
             hovertemplate='<b>%{x}</b><br>Copies: %{y:,}<extra></extra>'
         ),
@@ -1543,36 +1771,32 @@ def create_3d_print_comparison(df):
     if "Special Information (Operator Only) Machine" in df3d.columns:
         st.markdown("#### 🤖 Copies by Season and Machine (Stacked Horizontal)")
 
-        machine_pivot = df3d.pivot_table(
-            values="Copies",
-            index="Season",
-            columns="Special Information (Operator Only) Machine",
-            aggfunc="sum",
-            fill_value=0
-        )
-
-        fig = go.Figure()
-
-        for machine in machine_pivot.columns:
-            fig.add_trace(go.Bar(
-                name=str(machine),
-                y=machine_pivot.index,
-                x=machine_pivot[machine],
-                orientation='h',
-                text=[f'{int(x):,}' if x > 0 else '' for x in machine_pivot[machine]],
-                textposition='inside',
-                hovertemplate=f'<b>{machine}</b><br>Season: %{{y}}<br>Copies: %{{x:,}}<extra></extra>'
-            ))
-
-        fig.update_layout(
-            barmode='stack',
-            title="Sum of Copies by Season and Machine",
-            xaxis_title="Sum of Copies",
-            yaxis_title="Season",
-            height=450,
-            hovermode='y unified',
-            legend_title="Machine"
-        )
+        machine_pivot = sum_matrix(df3d, "Season", "Special Information (Operator Only) Machine")
+
+        fig = go.Figure(dict(
+            data=[
+                dict(
+                    type='bar',
+                    name=str(machine),
+                    y=machine_pivot.index,
+                    x=machine_pivot[machine],
+                    orientation='h',
+                    texttemplate=np.where(machine_pivot[machine] > 0, '%{x:,}', ''),
+                    textposition='inside',
+                    hovertemplate=f'<b>{machine}</b><br>Season: %{{y}}<br>Copies: %{{x:,}}<extra></extra>'
+                )
+                for machine in machine_pivot.columns
+            ],
+            layout=dict(
+                barmode='stack',
+                title="Sum of Copies by Season and Machine",
+                xaxis_title="Sum of Copies",
+                yaxis_title="Season",
+                height=450,
+                hovermode='y unified',
+                legend_title="Machine"
+            )
+        ))
 
         st.plotly_chart(fig, use_container_width=True)
 
@@ -1580,35 +1804,31 @@ def create_3d_print_comparison(df):
     if "Material name" in df3d.columns:
         st.markdown("#### 🧱 Copies by Season and Material (Grouped)")
 
-        material_pivot = df3d.pivot_table(
-            values="Copies",
-            index="Season",
-            columns="Material name",
-            aggfunc="sum",
-            fill_value=0
-        )
-
-        fig = go.Figure()
+        material_pivot = sum_matrix(df3d, "Season", "Material name")
 
-        for material in material_pivot.columns:
-            fig.add_trace(go.Bar(
-                name=str(material),
-                x=material_pivot.index,
-                y=material_pivot[material],
-                text=[f'{int(x):,}' if x > 0 else '' for x in material_pivot[material]],
-                textposition='outside',
-                hovertemplate=f'<b>{material}</b><br>Season: %{{x}}<br>Copies: %{{y:,}}<extra></extra>'
-            ))
-
-        fig.update_layout(
-            barmode='group',
-            title="Sum of Copies by Season and Material Name",
-            xaxis_title="Season",
-            yaxis_title="Sum of Copies",
-            height=450,
-            hovermode='x unified',
-            legend_title="Material Name"
-        )
+        fig = go.Figure(dict(
+            data=[
+                dict(
+                    type='bar',
+                    name=str(material),
+                    x=material_pivot.index,
+                    y=material_pivot[material],
+                    texttemplate=np.where(material_pivot[material] > 0, '%{y:,}', ''),
+                    textposition='outside',
+                    hovertemplate=f'<b>{material}</b><br>Season: %{{x}}<br>Copies: %{{y:,}}<extra></extra>'
+                )
+                for material in material_pivot.columns
+            ],
+            layout=dict(
+                barmode='group',
+                title="Sum of Copies by Season and Material Name",
+                xaxis_title="Season",
+                yaxis_title="Sum of Copies",
+                height=450,
+                hovermode='x unified',
+                legend_title="Material Name"
+            )
+        ))
 
         st.plotly_chart(fig, use_container_width=True)
 
@@ -1616,35 +1836,31 @@ def create_3d_print_comparison(df):
     if "Material name" in df3d.columns:
         st.markdown("#### 💰 Charged Amount by Season and Material (Grouped)")
 
-        material_amt_pivot = df3d.pivot_table(
-            values="Charged amount",
-            index="Season",
-            columns="Material name",
-            aggfunc="sum",
-            fill_value=0
-        )
-
-        fig = go.Figure()
+        material_amt_pivot = sum_matrix(df3d, "Season", "Material name", values="Charged amount")
 
-        for material in material_amt_pivot.columns:
-            fig.add_trace(go.Bar(
-                name=str(material),
-                x=material_amt_pivot.index,
-                y=material_amt_pivot[material],
-                text=[f'${x:,.0f}' if x > 0 else '' for x in material_amt_pivot[material]],
-                textposition='outside',
-                hovertemplate=f'<b>{material}</b><br>Season: %{{x}}<br>Revenue: $%{{y:,.2f}}<extra></extra>'
-            ))
-
-        fig.update_layout(
-            barmode='group',
-            title="Sum of Charged Amount by Season and Material Name",
-            xaxis_title="Season",
-            yaxis_title="Sum of Charged Amount",
-            height=450,
-            hovermode='x unified',
-            legend_title="Material Name"
-        )
+        fig = go.Figure(dict(
+            data=[
+                dict(
+                    type='bar',
+                    name=str(material),
+                    x=material_amt_pivot.index,
+                    y=material_amt_pivot[material],
+                    texttemplate=np.where(material_amt_pivot[material] > 0, '$%{y:,.0f}', ''),
+                    textposition='outside',
+                    hovertemplate=f'<b>{material}</b><br>Season: %{{x}}<br>Revenue: $%{{y:,.2f}}<extra></extra>'
+                )
+                for material in material_amt_pivot.columns
+            ],
+            layout=dict(
+                barmode='group',
+                title="Sum of Charged Amount by Season and Material Name",
+                xaxis_title="Season",
+                yaxis_title="Sum of Charged Amount",
+                height=450,
+                hovermode='x unified',
+                legend_title="Material Name"
+            )
+        ))
 
         st.plotly_chart(fig, use_container_width=True)
 
@@ -1652,36 +1868,32 @@ def create_3d_print_comparison(df):
     if "Special Information (Operator Only) Job difficulty" in df3d.columns:
         st.markdown("#### ⚙️ Copies by Season and Job Difficulty (Grouped Horizontal)")
 
-        job_pivot = df3d.pivot_table(
-            values="Copies",
-            index="Season",
-            columns="Special Information (Operator Only) Job difficulty",
-            aggfunc="sum",
-            fill_value=0
-        )
-
-        fig = go.Figure()
-
-        for job_diff in job_pivot.columns:
-            fig.add_trace(go.Bar(
-                name=str(job_diff),
-                y=job_pivot.index,
-                x=job_pivot[job_diff],
-                orientation='h',
-                text=[f'{int(x):,}' if x > 0 else '' for x in job_pivot[job_diff]],
-                textposition='outside',
-                hovertemplate=f'<b>{job_diff}</b><br>Season: %{{y}}<br>Copies: %{{x:,}}<extra></extra>'
-            ))
-
-        fig.update_layout(
-            barmode='group',
-            title="Sum of Copies by Season and Job Difficulty",
-            xaxis_title="Sum of Copies",
-            yaxis_title="Season",
-            height=450,
-            hovermode='y unified',
-            legend_title="Job Difficulty"
-        )
+        job_pivot = sum_matrix(df3d, "Season", "Special Information (Operator Only) Job difficulty")
+
+        fig = go.Figure(dict(
+            data=[
+                dict(
+                    type='bar',
+                    name=str(job_diff),
+                    y=job_pivot.index,
+                    x=job_pivot[job_diff],
+                    orientation='h',
+                    texttemplate=np.where(job_pivot[job_diff] > 0, '%{x:,}', ''),
+                    textposition='outside',
+                    hovertemplate=f'<b>{job_diff}</b><br>Season: %{{y}}<br>Copies: %{{x:,}}<extra></extra>'
+                )
+                for job_diff in job_pivot.columns
+            ],
+            layout=dict(
+                barmode='group',
+                title="Sum of Copies by Season and Job Difficulty",
+                xaxis_title="Sum of Copies",
+                yaxis_title="Season",
+                height=450,
+                hovermode='y unified',
+                legend_title="Job Difficulty"
+            )
+        ))
 
         st.plotly_chart(fig, use_container_width=True)
 
@@ -1689,183 +1901,158 @@ def create_3d_print_comparison(df):
     if "Material name" in df3d.columns:
         st.markdown("#### 🧱 Material Usage Evolution (Stacked Area)")
 
-        material_pivot = df3d.pivot_table(
-            values="Copies",
-            index="Season",
-            columns="Material name",
-            aggfunc="sum",
-            fill_value=0
-        )
-
-        fig = go.Figure()
-
-        for material in material_pivot.columns:
-            fig.add_trace(go.Scatter(
-                name=str(material),
-                x=material_pivot.index,
-                y=material_pivot[material],
-                mode='lines+markers',
-                line=dict(width=3),
-                marker=dict(size=10),
-                stackgroup='one',
-                hovertemplate=f'<b>{material}</b><br>Season: %{{x}}<br>Copies: %{{y:,}}<extra></extra>'
-            ))
-
-        fig.update_layout(
-            title="Material Usage Over Time (Stacked Area)",
-            xaxis_title="Season",
-            yaxis_title="Copies",
-            height=450,
-            hovermode='x unified'
-        )
+        # Reuses the Season x Material matrix from the grouped chart above
+        fig = go.Figure(dict(
+            data=[
+                dict(
+                    type='scatter',
+                    name=str(material),
+                    x=material_pivot.index,
+                    y=material_pivot[material],
+                    mode='lines+markers',
+                    line=dict(width=3),
+                    marker=dict(size=10),
+                    stackgroup='one',
+                    hovertemplate=f'<b>{material}</b><br>Season: %{{x}}<br>Copies: %{{y:,}}<extra></extra>'
+                )
+                for material in material_pivot.columns
+            ],
+            layout=dict(
+                title="Material Usage Over Time (Stacked Area)",
+                xaxis_title="Season",
+                yaxis_title="Copies",
+                height=450,
+                hovermode='x unified'
+            )
+        ))
 
         st.plotly_chart(fig, use_container_width=True)
 
-def create_document_comparison(df):
+def create_document_comparison(df_doc):
     """Enhanced Document comparison"""
     st.markdown('<p class="category-header">📄 DOCUMENT COMPARISON</p>', unsafe_allow_html=True)
 
-    df_doc = df[df["Product name"].str.strip() == "Document"].copy()
-
     if len(df_doc) == 0:
         st.warning("No Document data found")
         return
 
-    col1, col2 = st.columns(2)
+    # One pass over Season feeds every per-season total below
+    season_totals = df_doc.groupby("Season", observed=True)[["Copies", "Charged amount"]].sum()
 
-    # Copies trend
-    with col1:
-        st.markdown("#### 📄 Copies Trend")
+    # Copies and revenue trends side by side in one figure
+    copies_by_season = season_totals["Copies"]
+    revenue_by_season = season_totals["Charged amount"]
 
-        copies_by_season = df_doc.groupby("Season")["Copies"].sum()
+    fig = make_subplots(rows=1, cols=2, subplot_titles=("📄 Copies Trend", "💰 Revenue Trend"))
 
-        fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=copies_by_season.index,
+        y=copies_by_season.values,
+        mode='lines+markers',
+        fill='tozeroy',
+        line=dict(color='#ff7f0e', width=4),
+        marker=dict(size=12, symbol='diamond'),
+        texttemplate='%{y:,}',
+        textposition='top center',
+        hovertemplate='<b>%{x}</b><br>Copies: %{y:,}<extra></extra>'
+    ), row=1, col=1)
 
-        fig.add_trace(go.Scatter(
-            x=copies_by_season.index,
-            y=copies_by_season.values,
-            mode='lines+markers',
-            fill='tozeroy',
-            line=dict(color='#ff7f0e', width=4),
-            marker=dict(size=12, symbol='diamond'),
-            text=[f'{int(x):,}' for x in copies_by_season.values],
-            textposition='top center',
-            hovertemplate='<b>%{x}</b><br>Copies: %{y:,}<extra></extra>'
-        ))
-
-        fig.update_layout(height=400, hovermode='x')
-        st.plotly_chart(fig, use_container_width=True)
-
-    # Revenue trend
-    with col2:
-        st.markdown("#### 💰 Revenue Trend")
-
-        revenue_by_season = df_doc.groupby("Season")["Charged amount"].sum()
-
-        fig = go.Figure()
-
-        fig.add_trace(go.Scatter(
-            x=revenue_by_season.index,
-            y=revenue_by_season.values,
-            mode='lines+markers',
-            fill='tozeroy',
-            line=dict(color='#2ca02c', width=4),
-            marker=dict(size=12, symbol='diamond'),
-            text=[f'${x:,.0f}' for x in revenue_by_season.values],
-            textposition='top center',
-            hovertemplate='<b>%{x}</b><br>Revenue: $%{y:,.2f}<extra></extra>'
-        ))
+    fig.add_trace(go.Scatter(
+        x=revenue_by_season.index,
+        y=revenue_by_season.values,
+        mode='lines+markers',
+        fill='tozeroy',
+        line=dict(color='#2ca02c', width=4),
+        marker=dict(size=12, symbol='diamond'),
+        texttemplate='$%{y:,.0f}',
+        textposition='top center',
+        hovertemplate='<b>%{x}</b><br>Revenue: $%{y:,.2f}<extra></extra>'
+    ), row=1, col=2)
 
-        fig.update_layout(height=400, hovermode='x')
-        st.plotly_chart(fig, use_container_width=True)
+    fig.update_layout(height=400, hovermode='x', showlegend=False)
+    st.plotly_chart(fig, use_container_width=True)
 
     # Paper type evolution
     if "Paper type" in df_doc.columns:
         st.markdown("#### 📋 Paper Type Evolution")
 
-        paper_pivot = df_doc.pivot_table(
-            values="Copies",
-            index="Season",
-            columns="Paper type",
-            aggfunc="sum",
-            fill_value=0
-        )
-
-        fig = go.Figure()
-
-        for paper in paper_pivot.columns:
-            fig.add_trace(go.Bar(
-                name=str(paper),
-                x=paper_pivot.index,
-                y=paper_pivot[paper],
-                text=[f'{int(x):,}' if x > 0 else '' for x in paper_pivot[paper]],
-                textposition='auto',
-                hovertemplate=f'<b>{paper}</b><br>Season: %{{x}}<br>Copies: %{{y:,}}<extra></extra>'
-            ))
+        paper_pivot = sum_matrix(df_doc, "Season", "Paper type")
 
-        fig.update_layout(
-            barmode='group',
-            height=400,
-            hovermode='x unified',
-            xaxis_title="Season",
-            yaxis_title="Copies"
-        )
+        fig = go.Figure(dict(
+            data=[
+                dict(
+                    type='bar',
+                    name=str(paper),
+                    x=paper_pivot.index,
+                    y=paper_pivot[paper],
+                    texttemplate=np.where(paper_pivot[paper] > 0, '%{y:,}', ''),
+                    textposition='auto',
+                    hovertemplate=f'<b>{paper}</b><br>Season: %{{x}}<br>Copies: %{{y:,}}<extra></extra>'
+                )
+                for paper in paper_pivot.columns
+            ],
+            layout=dict(
+                barmode='group',
+                height=400,
+                hovermode='x unified',
+                xaxis_title="Season",
+                yaxis_title="Copies"
+            )
+        ))
 
         st.plotly_chart(fig, use_container_width=True)
 
-def create_poster_comparison(df):
+def create_poster_comparison(df_poster):
     """Enhanced Poster comparison"""
     st.markdown('<p class="category-header">🖼️ LARGE FORMAT POSTER COMPARISON</p>', unsafe_allow_html=True)
 
-    df_poster = df[df["Product name"].str.strip() == "Large-Format Poster"].copy()
-
     if len(df_poster) == 0:
         st.warning("No Large-Format Poster data found")
         return
 
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown("#### 📄 Copies by Season")
+    # One pass over Season feeds every per-season total below
+    season_totals = df_poster.groupby("Season", observed=True)[["Copies", "Charged amount"]].sum()
 
-        copies_by_season = df_poster.groupby("Season")["Copies"].sum()
+    # Copies and revenue by season side by side in one figure
+    copies_by_season = season_totals["Copies"]
+    revenue_by_season = season_totals["Charged amount"]
 
-        fig = go.Figure(data=[go.Bar(
-            x=copies_by_season.index,
-            y=copies_by_season.values,
-            marker=dict(
-                color=copies_by_season.values,
-                colorscale='Reds',
-                showscale=True
-            ),
-            text=[f'{int(x):,}' for x in copies_by_season.values],
-            textposition='outside',
-            hovertemplate='<b>%{x}</b><br>Copies: %{y:,}<extra></extra>'
-        )])
-
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
-
-    with col2:
-        st.markdown("#### 💰 Revenue by Season")
+    fig = make_subplots(
+        rows=1, cols=2,
+        subplot_titles=("📄 Copies by Season", "💰 Revenue by Season"),
+        horizontal_spacing=0.15
+    )
 
-        revenue_by_season = df_poster.groupby("Season")["Charged amount"].sum()
+    fig.add_trace(go.Bar(
+        x=copies_by_season.index,
+        y=copies_by_season.values,
+        marker=dict(
+            color=copies_by_season.values,
+            colorscale='Reds',
+            showscale=True,
+            # Park the left colorbar in the gap between the subplots
+            colorbar=dict(x=0.44)
+        ),
+        texttemplate='%{y:,}',
+        textposition='outside',
+        hovertemplate='<b>%{x}</b><br>Copies: %{y:,}<extra></extra>'
+    ), row=1, col=1)
 
-        fig = go.Figure(data=[go.Bar(
-            x=revenue_by_season.index,
-            y=revenue_by_season.values,
-            marker=dict(
-                color=revenue_by_season.values,
-                colorscale='Purples',
-                showscale=True
-            ),
-            text=[f'${x:,.0f}' for x in revenue_by_season.values],
-            textposition='outside',
-            hovertemplate='<b>%{x}</b><br>Revenue: $%{y:,.2f}<extra></extra>'
-        )])
+    fig.add_trace(go.Bar(
+        x=revenue_by_season.index,
+        y=revenue_by_season.values,
+        marker=dict(
+            color=revenue_by_season.values,
+            colorscale='Purples',
+            showscale=True
+        ),
+        texttemplate='$%{y:,.0f}',
+        textposition='outside',
+        hovertemplate='<b>%{x}</b><br>Revenue: $%{y:,.2f}<extra></extra>'
+    ), row=1, col=2)
 
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
+    fig.update_layout(height=400, showlegend=False)
+    st.plotly_chart(fig, use_container_width=True)
 
     # Poster size comparison
     if "Paper size" in df_poster.columns:
@@ -1877,35 +2064,31 @@ def create_poster_comparison(df):
             size_chart_type = st.radio("Chart Type", ["Stacked", "Grouped"], key="poster_size_chart_type")
 
         with col2:
-            size_pivot = df_poster.pivot_table(
-                values="Copies",
-                index="Season",
-                columns="Paper size",
-                aggfunc="sum",
-                fill_value=0
-            )
-
-            fig = go.Figure()
-
-            for size in size_pivot.columns:
-                fig.add_trace(go.Bar(
-                    name=str(size),
-                    x=size_pivot.index,
-                    y=size_pivot[size],
-                    text=[f'{int(x):,}' if x > 0 else '' for x in size_pivot[size]],
-                    textposition='auto' if size_chart_type == "Stacked" else 'outside',
-                    hovertemplate=f'<b>{size}</b><br>Season: %{{x}}<br>Copies: %{{y:,}}<extra></extra>'
-                ))
-
-            fig.update_layout(
-                barmode='stack' if size_chart_type == "Stacked" else 'group',
-                height=450,
-                hovermode='x unified',
-                xaxis_title="Season",
-                yaxis_title="Copies",
-                legend_title="Poster Size",
-                title=f"Sum of Copies by Season and Paper Size ({size_chart_type})"
-            )
+            size_pivot = sum_matrix(df_poster, "Season", "Paper size")
+
+            fig = go.Figure(dict(
+                data=[
+                    dict(
+                        type='bar',
+                        name=str(size),
+                        x=size_pivot.index,
+                        y=size_pivot[size],
+                        texttemplate=np.where(size_pivot[size] > 0, '%{y:,}', ''),
+                        textposition='auto' if size_chart_type == "Stacked" else 'outside',
+                        hovertemplate=f'<b>{size}</b><br>Season: %{{x}}<br>Copies: %{{y:,}}<extra></extra>'
+                    )
+                    for size in size_pivot.columns
+                ],
+                layout=dict(
+                    barmode='stack' if size_chart_type == "Stacked" else 'group',
+                    height=450,
+                    hovermode='x unified',
+                    xaxis_title="Season",
+                    yaxis_title="Copies",
+                    legend_title="Poster Size",
+                    title=f"Sum of Copies by Season and Paper Size ({size_chart_type})"
+                )
+            ))
 
             st.plotly_chart(fig, use_container_width=True)
 
@@ -1948,27 +2131,25 @@ def main():
 
         if uploaded_file:
             try:
-                # Read CSV with encoding handling
-                try:
-                    df = pd.read_csv(uploaded_file, encoding='utf-8')
-                except:
-                    uploaded_file.seek(0)
-                    try:
-                        df = pd.read_csv(uploaded_file, encoding='latin-1')
-                    except:
-                        uploaded_file.seek(0)
-                        df = pd.read_csv(uploaded_file, encoding='cp1252')
+                # Read + clean once per distinct upload; reruns hit the cache
+                upload_key = file_key(uploaded_file)
+                df_cleaned = load_and_clean(upload_key, uploaded_file.name, uploaded_file)
 
-                st.success(f"✅ Loaded {len(df):,} rows and {len(df.columns)} columns")
+                # Season is only used by the multi-year tab; keep it out of the single-year schema
+                export_columns = [col for col in df_cleaned.columns if col != "Season"]
+                st.success(f"✅ Loaded {len(df_cleaned):,} rows and {len(export_columns)} columns (after cleaning)")
 
                 # Validate
                 required = ["Product name", "Copies", "Charged"]
-                is_valid, missing, msg = validate_columns(df, required)
+                is_valid, missing, msg = validate_columns(df_cleaned, required)
 
                 if not is_valid:
                     st.error(msg)
                 else:
-                    df_cleaned = clean_data(df.copy())
+                    # One scan splits the frame; each category tab gets its slice
+                    data_key = (upload_key, uploaded_file.name)
+                    product_slices = split_by_product(data_key, df_cleaned)
+                    no_rows = df_cleaned.iloc[0:0]
 
                     # Category tabs with icons
                     cat_tabs = st.tabs([
@@ -1979,16 +2160,16 @@ def main():
                     ])
 
                     with cat_tabs[0]:
-                        create_overall_visualizations(df_cleaned)
+                        create_overall_visualizations(df_cleaned, data_key + ("Overall",))
 
                     with cat_tabs[1]:
-                        create_3d_print_visualizations(df_cleaned)
+                        create_3d_print_visualizations(product_slices.get("3D Print", no_rows), data_key + ("3D Print",))
 
                     with cat_tabs[2]:
-                        create_document_visualizations(df_cleaned)
+                        create_document_visualizations(product_slices.get("Document", no_rows), data_key + ("Document",))
 
                     with cat_tabs[3]:
-                        create_poster_visualizations(df_cleaned)
+                        create_poster_visualizations(product_slices.get("Large-Format Poster", no_rows), data_key + ("Large-Format Poster",))
 
                     # Download section
                     st.markdown("---")
@@ -1999,7 +2180,7 @@ def main():
                     with col1:
                         st.download_button(
                             "📥 Download Cleaned CSV",
-                            df_cleaned.to_csv(index=False),
+                            csv_bytes(data_key, df_cleaned, exclude=("Season",)),
                             f"cleaned_{uploaded_file.name}",
                             "text/csv",
                             use_container_width=True
@@ -2031,25 +2212,17 @@ def main():
                 st.success(f"✅ Uploaded {len(uploaded_files)} file(s)")
 
                 dfs = []
+                file_keys = []
                 file_info = []
 
                 for file in uploaded_files:
-                    try:
-                        df = pd.read_csv(file, encoding='utf-8')
-                    except:
-                        file.seek(0)
-                        try:
-                            df = pd.read_csv(file, encoding='latin-1')
-                        except:
-                            file.seek(0)
-                            df = pd.read_csv(file, encoding='cp1252')
-
-                    season = extract_season_from_filename(file.name)
-                    df['Season'] = season
+                    key = file_key(file)
+                    df = load_and_clean(key, file.name, file)
                     dfs.append(df)
+                    file_keys.append((file.name, key))
                     file_info.append({
                         'Filename': file.name,
-                        'Season': season,
+                        'Season': extract_season_from_filename(file.name),
                         'Rows': len(df)
                     })
 
@@ -2057,10 +2230,12 @@ def main():
                 with st.expander("📋 File Summary", expanded=True):
                     st.dataframe(pd.DataFrame(file_info), use_container_width=True)
 
-                merged_df = pd.concat(dfs, ignore_index=True)
-                merged_cleaned = clean_data(merged_df.copy())
+                merged_cleaned = merge_cleaned(tuple(file_keys), dfs)
+                # One scan splits the merged frame; each product tab gets its slice
+                merged_slices = split_by_product(tuple(file_keys), merged_cleaned)
+                no_merged_rows = merged_cleaned.iloc[0:0]
 
-                st.success(f"✅ Merged {len(merged_df):,} total rows from {len(uploaded_files)} files")
+                st.success(f"✅ Merged {len(merged_cleaned):,} total rows from {len(uploaded_files)} files")
 
                 # Comparison category tabs
                 comp_tabs = st.tabs([
@@ -2074,13 +2249,13 @@ def main():
                     create_overall_comparison(merged_cleaned)
 
                 with comp_tabs[1]:
-                    create_3d_print_comparison(merged_cleaned)
+                    create_3d_print_comparison(merged_slices.get("3D Print", no_merged_rows))
 
                 with comp_tabs[2]:
-                    create_document_comparison(merged_cleaned)
+                    create_document_comparison(merged_slices.get("Document", no_merged_rows))
 
                 with comp_tabs[3]:
-                    create_poster_comparison(merged_cleaned)
+                    create_poster_comparison(merged_slices.get("Large-Format Poster", no_merged_rows))
 
                 # Download
                 st.markdown("---")
@@ -2088,7 +2263,7 @@ def main():
 
                 st.download_button(
                     "📥 Download Merged & Cleaned CSV",
-                    merged_cleaned.to_csv(index=False),
+                    csv_bytes(tuple(file_keys), merged_cleaned),
                     "merged_cleaned.csv",
                     "text/csv",
                     use_container_width=True
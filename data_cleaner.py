@@ -1,4 +1,5 @@
 import pandas as pd
+import io
 import os
 import sys
 
@@ -43,53 +44,60 @@ def clean_data(input_file, output_file=None):
     try:
         if file_extension == '.xlsx':
             print(f"Reading XLSX file: {input_file}")
+            # read_excel parses every cell even with usecols, so a header probe would
+            # only add a second workbook load; read once and drop instead
             df = pd.read_excel(input_file)
+            header = df.columns
         elif file_extension == '.csv':
             print(f"Reading CSV file: {input_file}")
-            # Try different encodings
+            # Read the bytes once and settle the encoding with a strict decode
+            with open(input_file, 'rb') as f:
+                raw = f.read()
             try:
-                df = pd.read_csv(input_file, encoding='utf-8')
+                raw.decode('utf-8')
+                encoding = 'utf-8'
             except UnicodeDecodeError:
-                print("UTF-8 failed, trying latin-1 encoding...")
-                try:
-                    df = pd.read_csv(input_file, encoding='latin-1')
-                except UnicodeDecodeError:
-                    print("latin-1 failed, trying cp1252 encoding...")
-                    df = pd.read_csv(input_file, encoding='cp1252')
+                print("UTF-8 failed, using latin-1 encoding...")
+                encoding = 'latin-1'
+            header = pd.read_csv(io.BytesIO(raw), encoding=encoding, nrows=0).columns
         else:
             raise ValueError(f"Unsupported file format: {file_extension}. Please use .xlsx or .csv")
 
-        print(f"Original shape: {df.shape}")
-        print(f"Original columns: {list(df.columns)}\n")
-
-        # Find columns that exist in the dataframe (case-insensitive matching)
+        # Find columns that exist in the file (case-insensitive matching)
         columns_found = []
         columns_not_found = []
 
+        # Lower-cased name -> first column with that name, built once
+        lowered = {}
+        for col in header:
+            lowered.setdefault(col.lower(), col)
+
         for col_to_remove in columns_to_remove:
             # Try exact match first
-            if col_to_remove in df.columns:
+            if col_to_remove in header:
                 columns_found.append(col_to_remove)
+            # Then case-insensitive match
+            elif col_to_remove.lower() in lowered:
+                columns_found.append(lowered[col_to_remove.lower()])
             else:
-                # Try case-insensitive match
-                matched = False
-                for col in df.columns:
-                    if col.lower() == col_to_remove.lower():
-                        columns_found.append(col)
-                        matched = True
-                        break
-                if not matched:
-                    columns_not_found.append(col_to_remove)
-
-        # Remove the columns
+                columns_not_found.append(col_to_remove)
+
+        if file_extension == '.xlsx':
+            df_cleaned = df.drop(columns=columns_found)
+        else:
+            # Skip the removed columns at parse time instead of reading and then dropping them
+            keep = [col for col in header if col not in columns_found]
+            df_cleaned = pd.read_csv(io.BytesIO(raw), encoding=encoding, usecols=keep)
+
+        print(f"Original shape: {(len(df_cleaned), len(header))}")
+        print(f"Original columns: {list(header)}\n")
+
         if columns_found:
             print(f"Removing {len(columns_found)} columns:")
             for col in columns_found:
                 print(f"  - {col}")
-            df_cleaned = df.drop(columns=columns_found)
         else:
             print("No columns to remove found in the dataset.")
-            df_cleaned = df.copy()
 
         if columns_not_found:
             print(f"\nColumns not found in dataset ({len(columns_not_found)}):")
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+import app
+
+
+def frame():
+    return pd.DataFrame({
+        "Order status": pd.Categorical(["Done", "Pending", None, "Done", "Void"]),
+        "Paper size": ["A4", "A3", "A4", None, "A3"],
+        "Copies": [1, 2, 3, 4, 5],
+    })
+
+
+def test_no_filters_returns_the_frame():
+    df = frame()
+
+    assert app.apply_filters(df, {}) is df
+
+
+def test_empty_selection_keeps_every_row():
+    df = frame()
+
+    assert app.apply_filters(df, {"Order status": [], "Paper size": []})["Copies"].tolist() == [1, 2, 3, 4, 5]
+
+
+def test_categorical_lookup_matches_isin():
+    df = frame()
+
+    result = app.apply_filters(df, {"Order status": ["Done", "Void", "Missing"]})
+
+    assert result["Copies"].tolist() == [1, 4, 5]
+    expected = df["Order status"].astype(object).isin(["Done", "Void", "Missing"]).to_numpy()
+    assert np.array_equal(result.index.to_numpy(), np.flatnonzero(expected))
+
+
+def test_filters_combine_across_columns():
+    result = app.apply_filters(frame(), {"Order status": ["Done", "Pending"], "Paper size": ["A4"]})
+
+    assert result["Copies"].tolist() == [1]
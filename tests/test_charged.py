@@ -0,0 +1,32 @@
+import pandas as pd
+
+import app
+
+
+def charged(labels):
+    return pd.Series(pd.Categorical(labels, categories=["No", "Unknown", "Yes"]))
+
+
+def test_counts_drop_unused_labels_and_sort_largest_first():
+    counts = app.charged_counts(charged(["Yes", "No", "Yes", None, "Yes", "No"]))
+
+    assert counts.index.tolist() == ["Yes", "No"]
+    assert counts.tolist() == [3, 2]
+
+
+def test_counts_match_value_counts():
+    series = charged(["No", "Unknown", "Yes", "Yes", "Unknown", "Yes"])
+
+    counts = app.charged_counts(series)
+
+    expected = series.value_counts()
+    assert counts.to_dict() == expected[expected > 0].to_dict()
+
+
+def test_rate_is_share_of_yes():
+    assert app.charged_rate(app.charged_counts(charged(["Yes", "No", "No", "Unknown"]))) == 25.0
+    assert app.charged_rate(app.charged_counts(charged(["No", "Unknown"]))) == 0.0
+
+
+def test_rate_of_no_rows_is_zero():
+    assert app.charged_rate(app.charged_counts(charged([]))) == 0.0
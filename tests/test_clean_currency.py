@@ -0,0 +1,27 @@
+import pandas as pd
+
+import app
+
+
+def test_strips_symbols_separators_and_whitespace():
+    series = pd.Series(["$1,234.50", " $ 2.25 ", "3", "n/a", None])
+
+    cleaned = app.clean_currency(series)
+
+    assert cleaned.dtype == "float64"
+    assert cleaned.iloc[:3].tolist() == [1234.5, 2.25, 3.0]
+    assert cleaned.iloc[3:].isna().all()
+
+
+def test_numeric_input_is_not_downcast():
+    cleaned = app.clean_currency(pd.Series([1.5, 2.0]))
+
+    assert cleaned.dtype == "float64"
+    assert cleaned.tolist() == [1.5, 2.0]
+
+
+def test_revenue_sum_keeps_cents():
+    cleaned = app.clean_currency(pd.Series(["$0.10"] * 10 + ["$5477.67"]))
+
+    assert round(cleaned.sum(), 2) == 5478.67
+    assert f"{cleaned.sum():.6f}" == "5478.670000"
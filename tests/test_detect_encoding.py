@@ -0,0 +1,11 @@
+import app
+
+
+def test_utf8_bytes():
+    assert app.detect_encoding("Product name,Notes\nPoster,café ✓\n".encode("utf-8")) == "utf-8"
+    assert app.detect_encoding(b"Product name,Copies\n3D Print,2\n") == "utf-8"
+
+
+def test_invalid_utf8_falls_back_to_latin1():
+    assert app.detect_encoding("Product name,Notes\nPoster,café\n".encode("latin-1")) == "latin-1"
+    assert app.detect_encoding(b"\x93quoted\x94") == "latin-1"
@@ -0,0 +1,27 @@
+import numpy as np
+
+import app
+
+
+def test_short_series_passes_through():
+    y = np.arange(10)
+
+    assert app.lttb_indices(np.arange(10), y, 10).tolist() == list(range(10))
+    assert app.lttb_indices(np.arange(10), y, 50).tolist() == list(range(10))
+
+
+def test_threshold_below_three_passes_through():
+    assert app.lttb_indices(np.arange(10), np.arange(10), 2).tolist() == list(range(10))
+
+
+def test_keeps_endpoints_and_extremes():
+    x = np.arange(1000)
+    y = np.sin(x / 50.0)
+    y[437] = 25.0
+
+    keep = app.lttb_indices(x, y, 100)
+
+    assert len(keep) == 100
+    assert keep[0] == 0 and keep[-1] == 999
+    assert (np.diff(keep) > 0).all()
+    assert 437 in keep
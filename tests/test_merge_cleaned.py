@@ -0,0 +1,29 @@
+import io
+
+import pandas as pd
+import pytest
+
+import app
+
+MACHINE = "Special Information (Operator Only) Machine"
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "PARQUET_CACHE_DIR", str(tmp_path))
+
+
+def cleaned(key, text):
+    return app.read_cleaned(key, io.BytesIO(text.encode("utf-8")))
+
+
+def test_merge_with_all_blank_label_column():
+    fall = cleaned("fall", f"Product name,Copies,Charged,{MACHINE}\n3D Print,2,Yes,Prusa\n")
+    spring = cleaned("spring", f"Product name,Copies,Charged,{MACHINE}\n3D Print,1,No,\n")
+
+    merged = app.merge_cleaned((("fall", "a"), ("spring", "b")), [fall, spring])
+
+    assert isinstance(merged[MACHINE].dtype, pd.CategoricalDtype)
+    assert merged[MACHINE].tolist()[0] == "Prusa"
+    assert merged[MACHINE].isna().tolist() == [False, True]
+    assert merged["Copies"].tolist() == [2, 1]
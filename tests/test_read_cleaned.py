@@ -0,0 +1,79 @@
+import io
+
+import pytest
+
+import app
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "PARQUET_CACHE_DIR", str(tmp_path))
+
+
+def upload(text):
+    return io.BytesIO(text.encode("utf-8"))
+
+
+def test_trailing_blank_header_column():
+    f = upload(
+        "Product name,Copies,Charged,Email,\n"
+        "3D Print,2,Yes,a@b.edu,\n"
+        "Document,1,no,c@d.edu,\n"
+    )
+    df = app.read_cleaned("trailing", f)
+
+    assert "Email" not in df.columns
+    assert list(df["Copies"]) == [2, 1]
+    assert list(df["Charged"]) == ["Yes", "No"]
+
+
+def test_repeated_header_name():
+    f = upload(
+        "Product name,Copies,Notes,Email,Notes\n"
+        "3D Print,2,first,a@b.edu,second\n"
+    )
+    df = app.read_cleaned("repeated", f)
+
+    assert "Email" not in df.columns
+    assert list(df["Copies"]) == [2]
+    assert df.iloc[0].tolist()[-2:] == ["first", "second"]
+
+
+def test_quoted_header_and_bom():
+    f = io.BytesIO(
+        b'\xef\xbb\xbfProduct name,"Copies",Email,"Notes, if any"\r\n'
+        b'3D Print,2,a@b.edu,hi\r\n'
+    )
+    df = app.read_cleaned("quoted", f)
+
+    assert list(df.columns[:2]) == ["Product name", "Copies"]
+    assert "Email" not in df.columns
+    assert list(df["Notes, if any"]) == ["hi"]
+
+
+def test_ragged_rows_fall_back_to_c_engine():
+    f = upload(
+        "Product name,Copies,Charged,Email,\n"
+        "3D Print,2,Yes,a@b.edu,\n"
+        "Document,1,No\n"
+    )
+    df = app.read_cleaned("ragged", f)
+
+    assert "Email" not in df.columns
+    assert list(df["Copies"]) == [2, 1]
+    assert list(df["Charged"]) == ["Yes", "No"]
+
+
+def test_parquet_cache_is_private_and_bounded(tmp_path, monkeypatch):
+    cache = tmp_path / "dmc_cache"
+    monkeypatch.setattr(app, "PARQUET_CACHE_DIR", str(cache))
+
+    for i in range(app.PARQUET_CACHE_MAX_FILES + 3):
+        f = upload(f"Product name,Copies,Charged\n3D Print,{i},Yes\n")
+        app.read_cleaned(app.file_key(f), f)
+
+    files = list(cache.glob("*.parquet"))
+    assert len(files) == app.PARQUET_CACHE_MAX_FILES
+    assert not list(cache.glob("*.tmp"))
+    assert cache.stat().st_mode & 0o777 == 0o700
+    assert all(f.stat().st_mode & 0o777 == 0o600 for f in files)
@@ -0,0 +1,32 @@
+import pandas as pd
+
+import app
+
+
+def orders():
+    return pd.DataFrame({
+        "Season": ["Fall 2024", "Fall 2024", "Spring 2025", "Spring 2025", "Fall 2024"],
+        "Material name": ["PLA", "PETG", "PLA", "PLA", "PLA"],
+        "Copies": [1, 2, 3, 4, 5],
+    })
+
+
+def test_matches_pivot_table():
+    df = orders()
+
+    expected = df.pivot_table(values="Copies", index="Season", columns="Material name", aggfunc="sum", fill_value=0)
+
+    pd.testing.assert_frame_equal(app.sum_matrix(df, "Season", "Material name"), expected, check_names=False)
+
+
+def test_categorical_inputs_skip_unobserved_labels():
+    df = orders()
+    df["Season"] = pd.Categorical(df["Season"], categories=["Fall 2024", "Spring 2025", "Fall 2025"])
+    df["Material name"] = pd.Categorical(df["Material name"], categories=["PETG", "PLA", "TPU"])
+
+    matrix = app.sum_matrix(df, "Season", "Material name")
+
+    assert matrix.index.tolist() == ["Fall 2024", "Spring 2025"]
+    assert matrix.columns.tolist() == ["PETG", "PLA"]
+    assert matrix.loc["Spring 2025"].tolist() == [0, 7]
+    assert matrix.loc["Fall 2024"].tolist() == [2, 6]